@@ -7,8 +7,17 @@ import pandas as pd
 import time
 from datetime import datetime
 import json
+import hashlib
 import logging
+import threading
+from functools import lru_cache, partial
 from dotenv import load_dotenv
+import price_history
+import columnar_snapshots
+from price_parser import parse_price_series
+import shlex
+import scrape_jobs
+from data_manifest import DATA_MANIFEST_FILE, ManifestWatcher, atomic_write_json
 
 # .env dosyasını yükle
 load_dotenv()
@@ -18,6 +27,21 @@ PORT = int(os.getenv('DASHBOARD_PORT', 8054))
 DATA_FILE = os.getenv('DATA_FILE', 'price_data.json')
 COMPETITOR_DATA_FILE = os.getenv('COMPETITOR_DATA_FILE', 'all_competitor_prices.json')
 PRODUCT_DATA_DIR = os.getenv('PRODUCT_DATA_DIR', 'product_data')
+PRICE_HISTORY_DB = os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+# Veri kaynağı: json (COMPETITOR_DATA_FILE), sqlite (PRICE_HISTORY_DB son anlık görüntü)
+# veya columnar (SNAPSHOT_DIR altındaki son Arrow dosyası)
+DATA_SOURCE = os.getenv('DATA_SOURCE', 'json')
+# Bellekte tutulacak ürün grafiği sayısı
+FIGURE_CACHE_SIZE = int(os.getenv('FIGURE_CACHE_SIZE', 256))
+# Veri sürümü (manifest) kontrol aralığı (saniye); 0 ise otomatik yenileme kapalı
+MANIFEST_POLL_SECONDS = int(os.getenv('MANIFEST_POLL_SECONDS', 30))
+# "Verileri Güncelle" ile başlatılan taramanın komut satırı argümanları (örn: --incremental --workers 4)
+SCRAPE_JOB_ARGS = os.getenv('SCRAPE_JOB_ARGS', '')
+# Tarama işi durumunun kontrol aralığı (saniye)
+JOB_POLL_SECONDS = int(os.getenv('JOB_POLL_SECONDS', 3))
+# 'Satıcı sayısı şundan fazla' görünümünün varsayılan eşiği
+VIEW_MIN_SELLERS = int(os.getenv('VIEW_MIN_SELLERS', 3))
 
 # Logging ayarları
 logging.basicConfig(
@@ -42,6 +66,12 @@ app.title = "Trendyol Rakip Fiyat Takip Paneli"
 def load_data():
     """Ürün verilerini yükler."""
     try:
+        # Fiyat geçmişi veritabanından son anlık görüntüyü yükle
+        if DATA_SOURCE == 'sqlite' and PRICE_HISTORY_DB and os.path.exists(PRICE_HISTORY_DB):
+            competitor_data = price_history.latest_snapshot(PRICE_HISTORY_DB)
+            logger.info(f"Son anlık görüntü '{PRICE_HISTORY_DB}' veritabanından yüklendi: {len(competitor_data)} ürün.")
+            return competitor_data
+        
         # Rakip fiyatları yükle - öncelikle bunları kontrol edelim
         if os.path.exists(COMPETITOR_DATA_FILE):
             with open(COMPETITOR_DATA_FILE, 'r', encoding='utf-8') as f:
@@ -98,90 +128,358 @@ def load_data():
 def save_data(data):
     """Veriyi dosyaya kaydeder."""
     try:
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        atomic_write_json(DATA_FILE, data, ensure_ascii=False, indent=2)
         logger.info(f"Veri dosyaya kaydedildi: {len(data)} ürün.")
     except Exception as e:
         logger.error(f"Veri kaydedilirken hata oluştu: {str(e)}")
 
+PRODUCT_FIELDS = ["product_id", "product_name", "product_url", "product_image", "last_update",
+                  "my_price", "my_price_value", "competitors"]
+COMPETITOR_FIELDS = ["name", "price", "price_value"]
+OWN_SELLER = "Kendi Mağazam"
+CHEAPEST_LABEL = "✅ En Ucuz Fiyat!"
+
+def _price_column(values, texts):
+    """Kayıtlı sayısal fiyatları kullanır; sadece eksik olanları metinden çözer."""
+    prices = pd.to_numeric(values, errors="coerce").astype("float64")
+    missing = prices.isna() & texts.notna()
+    if missing.any():
+        # Eski kayıtlarda fiyat {'text': ...} sözlüğü ya da doğrudan sayı olabilir; sayılar olduğu gibi çözülür
+        missing_texts = texts[missing].map(lambda v: v.get("text") if isinstance(v, dict) else v)
+        prices[missing] = parse_price_series(missing_texts)
+    return prices
+
+def product_keys(df):
+    """Satırların ürün anahtarını döndürür: product_id, yoksa 'ad:<ürün adı>'."""
+    return df["Ürün ID"].astype(str).where(df["Ürün ID"].astype(bool), "ad:" + df["Ürün Adı"].astype(str))
+
+def add_price_rankings(df):
+    """Ürün bazında en ucuz bayrağını, fiyat sırasını ve en ucuza farkı ekler.
+    
+    Gruplama product_id ile yapılır; ID'si olmayan satırlar ürün adıyla gruplanır.
+    """
+    grouped = df.groupby(product_keys(df), sort=False)["Fiyat"]
+    min_price = grouped.transform("min")
+    df["En Ucuz"] = df["Fiyat"].notna() & (df["Fiyat"] == min_price)
+    df["Sıra"] = grouped.rank(method="min")
+    df["Fiyat Farkı"] = (df["Fiyat"] - min_price).round(2)
+    return df
+
 def create_price_dataframe(data):
-    """Fiyat verilerinden DataFrame oluşturur."""
+    """Fiyat verilerinden DataFrame oluşturur.
+    
+    Her ürün için önce kendi fiyatımız, ardından rakipler sırayla birer satır
+    olarak düzleştirilir; satır satır döngü yerine toplu pandas işlemleri kullanılır.
+    """
     if not data:
         logger.warning("Veri yok, boş DataFrame döndürülüyor.")
         return pd.DataFrame()
     
     logger.info(f"DataFrame oluşturuluyor, veri uzunluğu: {len(data)}")
-    logger.info(f"İlk ürün örneği: {data[0] if data else 'Veri yok'}")
+    logger.debug(f"İlk ürün örneği: {data[0]}")
     
-    rows = []
-    for product in data:
-        try:
-            # Ana ürün satırı
-            my_price = product.get("my_price", "0 TL")
-            if isinstance(my_price, dict) and "text" in my_price:
-                my_price = my_price["text"]
+    try:
+        products = pd.DataFrame.from_records(data, columns=PRODUCT_FIELDS)
+    except Exception as e:
+        logger.error(f"Ürün verisi tabloya dönüştürülürken hata: {str(e)}")
+        return pd.DataFrame()
+    products["product_id"] = products["product_id"].fillna("").astype(str)
+    for column in ["product_name", "product_url", "product_image", "last_update"]:
+        products[column] = products[column].fillna("")
+    
+    # Kendi fiyatımızın satırları
+    own = pd.DataFrame({
+        "Ürün Adı": products["product_name"],
+        "Satıcı": OWN_SELLER,
+        "Fiyat": _price_column(products["my_price_value"], products["my_price"].fillna("0 TL")),
+    })
+    
+    # Rakip satırları: her ürünün rakip listesi açılır, alanlar toplu okunur
+    competitor_lists = products["competitors"].where(products["competitors"].map(type) == list)
+    exploded = competitor_lists.explode().dropna()
+    if not exploded.empty:
+        competitors = pd.DataFrame.from_records(exploded.tolist(), columns=COMPETITOR_FIELDS, index=exploded.index)
+        comp = pd.DataFrame({
+            "Ürün Adı": products["product_name"].reindex(exploded.index),
+            "Satıcı": competitors["name"].fillna("Bilinmeyen"),
+            "Fiyat": _price_column(competitors["price_value"], competitors["price"].fillna("0 TL")),
+        }, index=exploded.index)
+        # Kararlı sıralama: her ürünün kendi satırı rakiplerinden önce gelir
+        df = pd.concat([own, comp]).sort_index(kind="stable")
+    else:
+        df = own
+    
+    product_columns = products.reindex(df.index)
+    df["URL"] = product_columns["product_url"]
+    df["Resim"] = product_columns["product_image"]
+    df["Son Güncelleme"] = product_columns["last_update"]
+    df["Ürün ID"] = product_columns["product_id"]
+    df = df.reset_index(drop=True)
+    
+    add_price_rankings(df)
+    logger.info(f"Toplam {len(df)} satır oluşturuldu ({len(products)} ürün, {int(df['En Ucuz'].sum())} en ucuz satır).")
+    if logger.isEnabledFor(logging.DEBUG):
+        cheapest = df[df["En Ucuz"]]
+        for name, seller, price in zip(cheapest["Ürün Adı"], cheapest["Satıcı"], cheapest["Fiyat"]):
+            logger.debug(f"'{name}' için en ucuz fiyat: {price}, satıcı: {seller}")
+    
+    return df
+
+def format_local_times(observed_at):
+    """UTC zaman damgalarını JSON ve sqlite kaynaklarındaki gibi yerel saatle biçimlendirir."""
+    if observed_at.dt.tz is None:
+        observed_at = observed_at.dt.tz_localize("UTC")
+    epochs = (observed_at - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    # Zamanlar ürün başına tekrarlandığı için her farklı değer bir kez biçimlendirilir
+    labels = {epoch: datetime.fromtimestamp(epoch).strftime("%d.%m.%Y %H:%M:%S") for epoch in epochs.dropna().unique()}
+    return epochs.map(labels)
+
+def snapshot_to_price_dataframe(snapshot):
+    """Sütunlu anlık görüntüyü create_price_dataframe çıktısıyla aynı sütunlara dönüştürür."""
+    if snapshot is None or snapshot.empty:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame({
+        "Ürün Adı": snapshot["product_name"].astype(str),
+        "Satıcı": snapshot["seller"].astype(str),
+        "Fiyat": snapshot["price"],
+        "URL": snapshot["product_url"],
+        "Resim": snapshot["product_image"],
+        "Son Güncelleme": format_local_times(snapshot["observed_at"]),
+        "Ürün ID": snapshot["product_id"].astype(str),
+    })
+    return add_price_rankings(df)
+
+def _file_signature(path):
+    """Dosyanın (yol, mtime, boyut) imzasını döndürür; dosya yoksa None değerleriyle."""
+    try:
+        stat = os.stat(path)
+        return (path, stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return (path, None, None)
+
+MANIFEST_WATCHER = ManifestWatcher(DATA_MANIFEST_FILE)
+
+def data_source_signature():
+    """Seçili veri kaynağının okuyacağı dosyaların imzalarını döndürür.
+    
+    Scraper veri sürümü (manifest) yayınladıysa imza sadece bu sürümdür.
+    Aksi halde dosyalar okunmaz, sadece stat ile kontrol edilir; imza
+    değişmedikçe önbellekteki veri kullanılır.
+    """
+    manifest = MANIFEST_WATCHER.read() if DATA_MANIFEST_FILE else None
+    if manifest:
+        return ('manifest', DATA_SOURCE, manifest['version'])
+    if DATA_SOURCE == 'columnar':
+        snapshots = columnar_snapshots.list_snapshots(SNAPSHOT_DIR)
+        if snapshots:
+            return ('columnar', _file_signature(snapshots[-1]))
+    if DATA_SOURCE == 'sqlite' and PRICE_HISTORY_DB:
+        database = _file_signature(PRICE_HISTORY_DB)
+        if database[1] is not None:
+            return ('sqlite', database, _file_signature(PRICE_HISTORY_DB + '-wal'))
+    return ('json', _file_signature(COMPETITOR_DATA_FILE), _file_signature(DATA_FILE))
+
+def signature_version(signature):
+    """İmzadan panelde kullanılan kısa veri sürümünü türetir."""
+    if signature[0] == 'manifest':
+        return signature[2]
+    return hashlib.sha1(repr(signature).encode('utf-8')).hexdigest()[:12]
+
+class PriceDataCache:
+    """Yüklenen veriyi ve türetilen DataFrame'i dosya imzasına göre önbellekte tutar.
+    
+    Flask'ın thread'li sunumunda aynı anda gelen istekler tek bir yükleme
+    bekler; imza değişmedikçe disk okunmaz ve DataFrame yeniden oluşturulmaz.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature = None
+        self._entry = None
+        self.hits = 0
+        self.loads = 0
+    
+    def get(self):
+        """Güncel önbellek kaydını (data, df, table, product_index, last_update, version) döndürür."""
+        signature = data_source_signature()
+        with self._lock:
+            if self._entry is not None and signature == self._signature:
+                self.hits += 1
+                return self._entry
             
-            row = {
-                "Ürün Adı": product.get("product_name", ""),
-                "Satıcı": "Kendi Mağazam",
-                "Fiyat": my_price.replace(" TL", "").replace(".", "").replace(",", ".") if isinstance(my_price, str) else my_price,
-                "URL": product.get("product_url", ""),
-                "Resim": product.get("product_image", ""),
-                "Son Güncelleme": product.get("last_update", ""),
-                "Ürün ID": product.get("product_id", "")
+            data, df, last_update = _load_price_data()
+            product_index = build_product_index(df)
+            self._entry = {
+                'version': signature_version(signature),
+                'data': data,
+                'df': df,
+                'table': build_table_frame(df),
+                'product_index': product_index,
+                'last_update': last_update,
+                # Görünüm ve grafik önbellekleri kayda bağlıdır; sonuçlar her zaman bu kaydın verisinden hesaplanır
+                'view_positions': lru_cache(maxsize=32)(partial(view_positions, df)),
+                'product_figure': lru_cache(maxsize=FIGURE_CACHE_SIZE)(partial(build_product_figure, df, product_index)),
             }
-            rows.append(row)
-            
-            # Rakip satırları
-            competitors = product.get("competitors", [])
-            logger.info(f"Ürün '{product.get('product_name', '')}' için {len(competitors)} rakip bulundu.")
-            
-            for comp in competitors:
-                comp_price = comp.get("price", "0 TL")
-                if isinstance(comp_price, dict) and "text" in comp_price:
-                    comp_price = comp_price["text"]
-                
-                comp_row = {
-                    "Ürün Adı": product.get("product_name", ""),
-                    "Satıcı": comp.get("name", "Bilinmeyen"),
-                    "Fiyat": comp_price.replace(" TL", "").replace(".", "").replace(",", ".") if isinstance(comp_price, str) else comp_price,
-                    "URL": product.get("product_url", ""),
-                    "Resim": product.get("product_image", ""),
-                    "Son Güncelleme": product.get("last_update", ""),
-                    "Ürün ID": product.get("product_id", "")
-                }
-                rows.append(comp_row)
+            self._signature = signature
+            self.loads += 1
+            logger.info(f"Veri önbelleği yenilendi (sürüm {self._entry['version']}, {len(df)} satır).")
+            return self._entry
+    
+    def current_version(self):
+        """Veriyi yüklemeden kaynağın güncel sürümünü döndürür."""
+        return signature_version(data_source_signature())
+    
+    def clear(self):
+        """Önbelleği boşaltır; sonraki istekte veri yeniden yüklenir."""
+        with self._lock:
+            self._signature = None
+            self._entry = None
+
+PRICE_DATA_CACHE = PriceDataCache()
+
+def _load_price_data():
+    """Veri kaynağından veriyi, DataFrame'i ve son güncelleme zamanını yükler."""
+    if DATA_SOURCE == 'columnar':
+        try:
+            snapshot = columnar_snapshots.load_latest_snapshot(SNAPSHOT_DIR)
+            if snapshot is not None:
+                df = snapshot_to_price_dataframe(snapshot)
+                logger.info(f"Son sütunlu anlık görüntü '{SNAPSHOT_DIR}' dizininden yüklendi: {len(df)} satır.")
+                last_update = df["Son Güncelleme"].iloc[0] if not df.empty else None
+                return snapshot, df, last_update
+            logger.warning(f"'{SNAPSHOT_DIR}' dizininde anlık görüntü bulunamadı, JSON verisi kullanılıyor.")
         except Exception as e:
-            logger.error(f"Ürün işlenirken hata: {str(e)}, Ürün: {product}")
+            logger.error(f"Sütunlu anlık görüntü yüklenirken hata: {str(e)}")
     
-    logger.info(f"Toplam {len(rows)} satır oluşturuldu.")
+    data = load_data()
+    last_update = data[0]["last_update"] if data and "last_update" in data[0] else None
+    return data, create_price_dataframe(data), last_update
+
+def build_product_index(df):
+    """Ürün anahtarından o ürünün satır konumlarına giden indeksi oluşturur."""
+    if df.empty:
+        return {}
+    return df.groupby(product_keys(df), sort=False).indices
+
+def build_table_frame(df):
+    """DataFrame'i tabloda gösterilecek biçime getirir (bağlantılar ve en ucuz etiketi)."""
+    table = df.copy()
+    if table.empty:
+        return table
     
-    if not rows:
-        logger.warning("Hiç satır oluşturulamadı, boş DataFrame döndürülüyor.")
-        return pd.DataFrame()
+    # URL'leri markdown bağlantılarına dönüştür
+    if "URL" in table.columns:
+        table["URL"] = ("[Ürün Linki](" + table["URL"] + ")").where(table["URL"].astype(bool), "")
     
-    df = pd.DataFrame(rows)
-    logger.info(f"DataFrame sütunları: {df.columns.tolist()}")
+    # En Ucuz sütununu daha kullanıcı dostu hale getir
+    if "En Ucuz" in table.columns:
+        table["En Ucuz"] = table["En Ucuz"].map({True: CHEAPEST_LABEL, False: ""})
+    return table
+
+# DataTable filtre sorgusu operatörleri (ilk eleman pandas karşılığı için kullanılır)
+FILTER_OPERATORS = [
+    ['ge ', '>='], ['le ', '<='], ['lt ', '<'], ['gt ', '>'],
+    ['ne ', '!='], ['eq ', '='], ['contains '], ['datestartswith '],
+]
+
+def split_filter_part(filter_part):
+    """'{sütun} operatör değer' biçimindeki filtre parçasını (sütun, operatör, değer) olarak ayırır.
+
+    Önce {sütun} okunur, operatör sadece hemen ardından gelen kısımda aranır;
+    değerin içindeki 'le ', '=' gibi metinler operatör sayılmaz.
+    """
+    filter_part = filter_part.strip()
+    if not filter_part.startswith('{') or '}' not in filter_part:
+        return None, None, None
+    name, rest = filter_part[1:].split('}', 1)
+    rest = rest.lstrip()
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if rest.startswith(operator):
+                value_part = rest[len(operator):].strip()
+                if not value_part:
+                    return None, None, None
+                quote = value_part[0]
+                if quote == value_part[-1] and quote in ("'", '"', '`') and len(value_part) > 1:
+                    value = value_part[1:-1].replace('\\' + quote, quote)
+                else:
+                    try:
+                        value = float(value_part)
+                    except ValueError:
+                        value = value_part
+                return name, operator_type[0].strip(), value
+    return None, None, None
+
+def apply_table_query(table, filter_query=None, sort_by=None):
+    """DataTable filtre sorgusunu ve sıralamasını sunucu tarafında uygular."""
+    if filter_query:
+        mask = pd.Series(True, index=table.index)
+        for filter_part in filter_query.split(' && '):
+            column, operator, value = split_filter_part(filter_part)
+            if column not in table.columns:
+                continue
+            values = table[column]
+            if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+                if isinstance(value, float) and not pd.api.types.is_numeric_dtype(values):
+                    values = pd.to_numeric(values, errors='coerce')
+                comparison = {'eq': values.eq, 'ne': values.ne, 'lt': values.lt,
+                              'le': values.le, 'gt': values.gt, 'ge': values.ge}[operator]
+                mask &= comparison(value)
+            elif operator == 'contains':
+                mask &= values.astype(str).str.contains(str(value), case=False, regex=False, na=False)
+            elif operator == 'datestartswith':
+                mask &= values.astype(str).str.startswith(str(value), na=False)
+        table = table[mask]
     
-    # Fiyat sütununu sayısal değere dönüştür
-    try:
-        df["Fiyat"] = pd.to_numeric(df["Fiyat"], errors="coerce")
-        logger.info("Fiyat sütunu sayısal değere dönüştürüldü.")
-    except Exception as e:
-        logger.error(f"Fiyat dönüştürülürken hata: {str(e)}")
-    
-    # En ucuz fiyatları işaretle
-    df["En Ucuz"] = False
-    for product_name in df["Ürün Adı"].unique():
-        product_df = df[df["Ürün Adı"] == product_name]
-        if not product_df.empty and product_df["Fiyat"].notna().any():
-            min_price = product_df["Fiyat"].min()
-            min_price_idx = product_df[product_df["Fiyat"] == min_price].index
-            if not min_price_idx.empty:
-                df.loc[min_price_idx, "En Ucuz"] = True
-                logger.info(f"'{product_name}' için en ucuz fiyat: {min_price}, satıcı: {df.loc[min_price_idx[0], 'Satıcı']}")
+    if sort_by:
+        columns = [item['column_id'] for item in sort_by if item['column_id'] in table.columns]
+        ascending = [item['direction'] == 'asc' for item in sort_by if item['column_id'] in table.columns]
+        if columns:
+            table = table.sort_values(columns, ascending=ascending, kind='stable', na_position='last')
+    return table
+
+# Tabloda gösterilen sütunlar; istemciye sadece bunlar gönderilir
+TABLE_COLUMNS = [
+    {"name": "Ürün Adı", "id": "Ürün Adı"},
+    {"name": "Satıcı", "id": "Satıcı"},
+    {"name": "Fiyat (TL)", "id": "Fiyat", "type": "numeric", "format": {"specifier": ",.2f"}},
+    {"name": "Sıra", "id": "Sıra", "type": "numeric"},
+    {"name": "En Ucuza Fark (TL)", "id": "Fiyat Farkı", "type": "numeric", "format": {"specifier": ",.2f"}},
+    {"name": "Ürün Linki", "id": "URL", "presentation": "markdown"},
+    {"name": "En Ucuz", "id": "En Ucuz", "presentation": "markdown"}
+]
+TABLE_COLUMN_IDS = [column["id"] for column in TABLE_COLUMNS]
+
+# Tablo görünümleri; hepsi sunucuda önbellekteki veriden hesaplanır
+VIEW_MODE_OPTIONS = [
+    {"label": "Tümü", "value": "all"},
+    {"label": "Sadece Rakipler", "value": "competitors"},
+    {"label": "En Ucuz Olmadığım Ürünler", "value": "not_cheapest"},
+    {"label": "Satıcı Sayısı Şundan Fazla:", "value": "many_sellers"},
+]
+
+def view_positions(df, view_mode, min_sellers):
+    """Görünüme giren satırların konumlarını döndürür.
+
+    Önbellek kaydındaki entry['view_positions'] ile (görünüm, N) başına bir kez hesaplanır.
+    """
+    if df.empty or view_mode == 'all':
+        return None
     
-    return df
+    is_own = df["Satıcı"] == OWN_SELLER
+    if view_mode == 'competitors':
+        mask = ~is_own
+    elif view_mode == 'not_cheapest':
+        # Kendi satırı olup en ucuz olmayan ürünlerin tüm satırları
+        keys = product_keys(df)
+        losing = set(keys[is_own & ~df["En Ucuz"].astype(bool)])
+        mask = keys.isin(losing)
+    elif view_mode == 'many_sellers':
+        mask = df.groupby(product_keys(df), sort=False)["Satıcı"].transform("size") > min_sellers
+    else:
+        return None
+    return mask.to_numpy().nonzero()[0]
 
 # Uygulama düzeni
 app.layout = html.Div([
@@ -197,8 +495,17 @@ app.layout = html.Div([
             )
         ], className="header-controls"),
         html.Div([
-            html.P(id="last-update-time", className="last-update-time")
-        ])
+            html.P(id="last-update-time", className="last-update-time"),
+            html.P(id="scrape-status", className="scrape-status")
+        ]),
+        # Tablo ve grafik callback'leri veri sürümü değişince yenilenir
+        dcc.Store(id="data-version"),
+        # Sadece küçük manifest dosyası kontrol edilir; sürüm değişmedikçe veri gönderilmez
+        dcc.Interval(id="manifest-poll", interval=max(1, MANIFEST_POLL_SECONDS) * 1000,
+                     disabled=not MANIFEST_POLL_SECONDS),
+        # Tarama işi ilerlemesi; sadece değiştiğinde tarayıcıya gönderilir
+        dcc.Interval(id="job-poll", interval=max(1, JOB_POLL_SECONDS) * 1000),
+        dcc.Store(id="job-status-key")
     ], className="header"),
     
     html.Div([
@@ -216,18 +523,19 @@ app.layout = html.Div([
         html.Div([
             html.H2("Tüm Ürünler ve Rakip Fiyatları"),
             html.Div([
-                html.Button("Sadece Rakipleri Göster", id="show-competitors-button", className="control-button", n_clicks=0),
-                html.Button("Tümünü Göster", id="show-all-button", className="control-button", n_clicks=0),
+                dcc.RadioItems(
+                    id="view-mode",
+                    options=VIEW_MODE_OPTIONS,
+                    value="all",
+                    inline=True,
+                    inputStyle={"marginRight": "5px", "marginLeft": "10px"},
+                ),
+                dcc.Input(id="min-sellers", type="number", min=1, step=1, value=VIEW_MIN_SELLERS,
+                          debounce=True, style={"width": "60px", "marginLeft": "5px"}),
             ], style={"marginBottom": "10px"}),
             dash_table.DataTable(
                 id="product-table",
-                columns=[
-                    {"name": "Ürün Adı", "id": "Ürün Adı"},
-                    {"name": "Satıcı", "id": "Satıcı"},
-                    {"name": "Fiyat (TL)", "id": "Fiyat", "type": "numeric", "format": {"specifier": ",.2f"}},
-                    {"name": "Ürün Linki", "id": "URL", "presentation": "markdown"},
-                    {"name": "En Ucuz", "id": "En Ucuz", "presentation": "markdown"}
-                ],
+                columns=TABLE_COLUMNS,
                 style_table={"overflowX": "auto"},
                 style_cell={
                     "textAlign": "left",
@@ -248,13 +556,19 @@ app.layout = html.Div([
                         "fontWeight": "bold",
                     },
                     {
-                        "if": {"filter_query": "{En Ucuz} = True"},
+                        "if": {"filter_query": "{En Ucuz} contains 'En Ucuz'"},
                         "backgroundColor": "#cff6cf",
                         "color": "green",
                     }
                 ],
-                sort_action="native",
-                filter_action="native",
+                # Sayfalama, sıralama ve filtreleme sunucuda yapılır; istemciye sadece görünen sayfa gönderilir
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="multi",
+                filter_action="custom",
+                filter_query="",
+                sort_by=[],
+                page_current=0,
                 page_size=15,
             ),
         ], className="card"),
@@ -264,79 +578,89 @@ app.layout = html.Div([
 @app.callback(
     [Output("product-dropdown", "options"),
      Output("product-dropdown", "value"),
-     Output("product-table", "data"),
+     Output("data-version", "data"),
      Output("last-update-time", "children")],
-    [Input("refresh-button", "n_clicks")],
+    [Input("refresh-button", "n_clicks"),
+     Input("manifest-poll", "n_intervals")],
+    [State("data-version", "data"),
+     State("product-dropdown", "value")],
     prevent_initial_call=False
 )
-def update_data(n_clicks):
+def update_data(n_clicks, n_intervals, data_version, selected_product):
     """Veriyi günceller veya mevcut veriyi yükler."""
-    data = load_data()
     
-    # İlk yükleme veya güncelleme isteği
-    if n_clicks is not None:
-        try:
-            # scraper = TrendyolScraper()
-            # new_data = scraper.analyze_all_products()
-            # scraper.close()
-            
-            # Zaman damgası ekle
-            # timestamp = datetime.now().strftime("%d.%m.%Y %H:%M:%S")
-            # for item in new_data:
-            #     item["last_update"] = timestamp
-            
-            # Veriyi güncelle ve kaydet
-            # data = new_data
-            # save_data(data)
-            logger.info("Veriler başarıyla güncellendi.")
-        except Exception as e:
-            logger.error(f"Veri güncellenirken hata oluştu: {str(e)}")
-    
-    # DataFrame oluştur
-    df = create_price_dataframe(data)
-    
-    # URL'leri markdown bağlantılarına dönüştür
-    if not df.empty and "URL" in df.columns:
-        df["URL"] = df.apply(lambda row: f"[Ürün Linki]({row['URL']})" if row['URL'] else "", axis=1)
+    # Periyodik kontrolde sürüm değişmediyse hiçbir şey gönderilmez
+    ctx = dash.callback_context
+    triggered = ctx.triggered[0]['prop_id'] if ctx.triggered else ''
+    if triggered.startswith("manifest-poll") and data_version == PRICE_DATA_CACHE.current_version():
+        raise dash.exceptions.PreventUpdate
     
-    # En Ucuz sütununu daha kullanıcı dostu hale getir
-    if not df.empty and "En Ucuz" in df.columns:
-        df["En Ucuz"] = df.apply(
-            lambda row: "✅ En Ucuz Fiyat!" if row["En Ucuz"] else "",
-            axis=1
-        )
+    # Önbellekteki veriyi al (dosyalar değişmediyse disk okunmaz)
+    entry = PRICE_DATA_CACHE.get()
+    df = entry['df']
+    data_last_update = entry['last_update']
     
-    # Dropdown seçenekleri
+    # Dropdown seçenekleri: etiket ürün adı, değer ürün anahtarı (product_id)
     dropdown_options = []
     if not df.empty:
-        unique_products = df["Ürün Adı"].unique()
-        dropdown_options = [{"label": product, "value": product} for product in unique_products]
+        names = df["Ürün Adı"].to_numpy()
+        dropdown_options = [{"label": names[positions[0]], "value": key}
+                            for key, positions in entry['product_index'].items()]
     
     # Son güncelleme zamanı
     last_update = "Son güncelleme: Henüz güncelleme yapılmadı"
-    if data and "last_update" in data[0]:
-        last_update = f"Son güncelleme: {data[0]['last_update']}"
+    if data_last_update:
+        last_update = f"Son güncelleme: {data_last_update}"
+    
+    # Yeni sürümde de varsa seçili ürün korunur
+    selected = None
+    if dropdown_options:
+        selected = selected_product if selected_product in entry['product_index'] else dropdown_options[0]["value"]
     
-    return dropdown_options, dropdown_options[0]["value"] if dropdown_options else None, df.to_dict("records"), last_update
+    return dropdown_options, selected, entry['version'], last_update
 
 @app.callback(
-    [Output("price-comparison-graph", "figure"),
-     Output("product-image-container", "children")],
-    [Input("product-dropdown", "value"),
-     Input("product-table", "data")],
-    prevent_initial_call=True
+    [Output("product-table", "data"),
+     Output("product-table", "page_count")],
+    [Input("product-table", "page_current"),
+     Input("product-table", "page_size"),
+     Input("product-table", "sort_by"),
+     Input("product-table", "filter_query"),
+     Input("view-mode", "value"),
+     Input("min-sellers", "value"),
+     Input("data-version", "data")]
 )
-def update_graph(selected_product, table_data):
-    """Seçilen ürün için fiyat karşılaştırma grafiğini günceller."""
-    if not selected_product or not table_data:
-        return px.bar(title="Lütfen bir ürün seçin"), []
+def update_table(page_current, page_size, sort_by, filter_query, view_mode, min_sellers, data_version):
+    """Seçili görünümü filtreleyip sıralar ve sadece istenen sayfayı döndürür."""
+    entry = PRICE_DATA_CACHE.get()
+    table = entry['table']
+    if table.empty:
+        return [], 1
     
-    # Seçilen ürün için verileri filtrele
-    df = pd.DataFrame(table_data)
-    filtered_df = df[df["Ürün Adı"] == selected_product].copy()
+    positions = entry['view_positions'](view_mode or 'all', int(min_sellers or VIEW_MIN_SELLERS))
+    if positions is not None:
+        table = table.iloc[positions]
+    table = apply_table_query(table, filter_query, sort_by)
+    page_size = page_size or 15
+    page_current = page_current or 0
+    page_count = max(1, -(-len(table) // page_size))
+    start = min(page_current, page_count - 1) * page_size
+    page = table.iloc[start:start + page_size]
+    return page[[column for column in TABLE_COLUMN_IDS if column in page.columns]].to_dict("records"), page_count
+
+def build_product_figure(df, product_index, product_key):
+    """Ürünün fiyat karşılaştırma grafiğini ve resmini oluşturur.
+    
+    Önbellek kaydındaki entry['product_figure'] ile ürün başına bir kez
+    hesaplanır; veri yenilenince eski kayıtla birlikte eski grafikler de bırakılır.
+    """
+    positions = product_index.get(product_key)
+    if positions is None:
+        return px.bar(title="Seçilen ürün için veri bulunamadı"), []
     
-    if filtered_df.empty:
-        return px.bar(title=f"{selected_product} için veri bulunamadı"), []
+    # Seçilen ürünün satırları indeksten alınır, tüm tablo taranmaz
+    filtered_df = df.iloc[positions].copy()
+    product_name = filtered_df["Ürün Adı"].iloc[0]
     
     # Ürün resmini al
     product_image = filtered_df["Resim"].iloc[0] if "Resim" in filtered_df.columns else ""
@@ -345,7 +669,7 @@ def update_graph(selected_product, table_data):
         image_element = [
             html.Div([
                 html.Img(src=product_image, className="product-image"),
-                html.P(selected_product, className="product-title")
+                html.P(product_name, className="product-title")
             ])
         ]
     
@@ -354,7 +678,7 @@ def update_graph(selected_product, table_data):
     
     # Kendi mağazamı vurgula
     filtered_df["Renk"] = "Rakip"
-    filtered_df.loc[filtered_df["Satıcı"] == "Kendi Mağazam", "Renk"] = "Kendi Mağazam"
+    filtered_df.loc[filtered_df["Satıcı"] == OWN_SELLER, "Renk"] = OWN_SELLER
     
     # Grafiği oluştur
     fig = px.bar(
@@ -362,8 +686,8 @@ def update_graph(selected_product, table_data):
         x="Satıcı",
         y="Fiyat",
         color="Renk",
-        title=f"{selected_product} - Fiyat Karşılaştırması",
-        color_discrete_map={"Kendi Mağazam": "#007bff", "Rakip": "#6c757d"},
+        title=f"{product_name} - Fiyat Karşılaştırması",
+        color_discrete_map={OWN_SELLER: "#007bff", "Rakip": "#6c757d"},
         labels={"Fiyat": "Fiyat (TL)"},
         text_auto='.2f'
     )
@@ -378,46 +702,121 @@ def update_graph(selected_product, table_data):
     
     return fig, image_element
 
+@app.callback(
+    [Output("price-comparison-graph", "figure"),
+     Output("product-image-container", "children")],
+    [Input("product-dropdown", "value"),
+     Input("data-version", "data")],
+    prevent_initial_call=True
+)
+def update_graph(selected_product, data_version):
+    """Seçilen ürün için fiyat karşılaştırma grafiğini günceller."""
+    if not selected_product:
+        return px.bar(title="Lütfen bir ürün seçin"), []
+    
+    # Sunucudaki güncel kayıt kullanılır; istemcideki sürüm sadece tetikleyicidir
+    return PRICE_DATA_CACHE.get()['product_figure'](selected_product)
+
+def format_duration(seconds):
+    """Saniyeyi '1 sa 5 dk', '3 dk 10 sn' gibi kısa metne çevirir."""
+    seconds = int(seconds or 0)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours} sa {minutes} dk"
+    if minutes:
+        return f"{minutes} dk {seconds} sn"
+    return f"{seconds} sn"
+
+JOB_PHASE_LABELS = {
+    'starting': "başlatılıyor",
+    'listing': "mağaza sayfaları taranıyor",
+    'products': "ürünler işleniyor",
+    'finalizing': "sonuçlar kaydediliyor",
+    'done': "tamamlandı",
+    'failed': "başarısız",
+}
+
+def describe_job(job):
+    """İş kaydını ve ilerleme bilgisini tek satırlık durum metnine çevirir."""
+    status = job['status']
+    progress = job.get('progress') or {}
+    if status in scrape_jobs.ACTIVE_STATUSES:
+        text = f"Tarama #{job['id']}: {JOB_PHASE_LABELS.get(progress.get('phase'), 'başlatılıyor')}"
+        total, done = progress.get('total') or 0, progress.get('done') or 0
+        if progress.get('phase') == 'products' and total:
+            text += f" {done}/{total} (%{done * 100 // total})"
+            if progress.get('rate'):
+                text += f", {progress['rate']:.2f} ürün/sn"
+            if progress.get('eta_seconds') is not None:
+                text += f", kalan ~{format_duration(progress['eta_seconds'])}"
+        rate_limit = progress.get('rate_limit')
+        if rate_limit:
+            text += f" | hız sınırı {rate_limit['rate']:.2f} istek/sn"
+            if rate_limit.get('decreases'):
+                text += f", {rate_limit['decreases']} geri çekilme"
+        return text
+    
+    duration = ""
+    if job.get('started_at') and job.get('finished_at'):
+        duration = f" ({format_duration(job['finished_at'] - job['started_at'])})"
+    if status == 'succeeded':
+        return f"Son tarama #{job['id']} tamamlandı{duration}: {progress.get('done', 0)} ürün işlendi."
+    if status == 'interrupted':
+        return f"Son tarama #{job['id']} yarıda kesildi."
+    return f"Son tarama #{job['id']} başarısız oldu{duration}, log: {job.get('log_file')}"
+
+# İş yöneticisi ilk kullanımda oluşturulur; app modülünü import etmek scrape_jobs.db oluşturmaz
+_scrape_jobs = None
+_scrape_jobs_lock = threading.Lock()
+
+def get_scrape_jobs():
+    """Dashboard sürecinin tek JobRunner örneğini döndürür."""
+    global _scrape_jobs
+    with _scrape_jobs_lock:
+        if _scrape_jobs is None:
+            _scrape_jobs = scrape_jobs.JobRunner()
+        return _scrape_jobs
+
 @app.callback(
     Output("refresh-output", "children"),
     [Input("refresh-button", "n_clicks")],
     prevent_initial_call=True
 )
-def show_refresh_message(n_clicks):
-    """Yenileme işlemi sonucunu gösterir."""
-    if n_clicks:
-        return html.Div("Veriler güncellendi!", style={"marginTop": "10px", "color": "green"})
-    return ""
+def start_scrape_job(n_clicks):
+    """Arka planda tarama işi başlatır; istek thread'i taramayı beklemez."""
+    if not n_clicks:
+        return ""
+    try:
+        job, created = get_scrape_jobs().start(shlex.split(SCRAPE_JOB_ARGS))
+    except Exception as e:
+        logger.error(f"Tarama işi başlatılırken hata: {str(e)}")
+        return html.Div("Tarama başlatılamadı!", style={"marginTop": "10px", "color": "red"})
+    if created:
+        message = f"Tarama #{job['id']} başlatıldı. Yeni veriler tarama bitince otomatik yüklenecek."
+    else:
+        message = f"Tarama #{job['id']} zaten çalışıyor."
+    return html.Div(message, style={"marginTop": "10px", "color": "green"})
 
 @app.callback(
-    Output("product-table", "data", allow_duplicate=True),
-    [Input("show-competitors-button", "n_clicks"),
-     Input("show-all-button", "n_clicks"),
-     Input("refresh-button", "n_clicks")],
-    [State("product-table", "data")],
-    prevent_initial_call=True
+    [Output("scrape-status", "children"),
+     Output("job-status-key", "data")],
+    [Input("job-poll", "n_intervals")],
+    [State("job-status-key", "data")]
 )
-def filter_table(show_competitors, show_all, refresh_clicks, table_data):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        return table_data
-        
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
-    
-    # Eğer refresh butonu tetiklendiyse, update_data callback'i zaten çalışacak
-    # Bu durumda hiçbir şey yapmayalım
-    if button_id == "refresh-button":
+def update_job_status(n_intervals, status_key):
+    """Son tarama işinin durumunu gösterir; durum değişmediyse güncelleme göndermez."""
+    job = get_scrape_jobs().latest_status()
+    if job is None:
+        key = None
+    else:
+        progress = job.get('progress') or {}
+        rate_limit = progress.get('rate_limit') or {}
+        key = (f"{job['id']}:{job['status']}:{progress.get('phase')}:{progress.get('done')}:"
+               f"{rate_limit.get('rate')}:{rate_limit.get('decreases')}")
+    if key == status_key and n_intervals:
         raise dash.exceptions.PreventUpdate
-    
-    if button_id == "show-competitors-button":
-        df = pd.DataFrame(table_data)
-        filtered_df = df[df["Satıcı"] != "Kendi Mağazam"]
-        return filtered_df.to_dict("records")
-    elif button_id == "show-all-button":
-        return table_data
-    
-    # Varsayılan olarak tüm verileri göster
-    return table_data
+    return (describe_job(job) if job else ""), key
 
 # CSS stilleri
 app.index_string = '''
@@ -481,6 +880,11 @@ app.index_string = '''
                 opacity: 0.9;
             }
             
+            .scrape-status {
+                margin-top: 5px;
+                font-size: 14px;
+            }
+            
             .content {
                 padding: 20px;
                 max-width: 1200px;
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Ürün sayfalarını tek süreçte asyncio ile tarayan motor."""
+
+import os
+import time
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+import aiohttp
+from yarl import URL
+
+from debug_capture import capture_debug
+from rate_limiter import RATE_LIMITER, challenge_reason
+from trendyol_http import BROWSER_HEADERS, HTTP_TIMEOUT_SECONDS, resolve_product_id, trendyol_cookies
+
+# Eşzamanlılık ayarları
+ASYNC_CONCURRENCY = int(os.getenv('ASYNC_CONCURRENCY', 50))
+ASYNC_PER_HOST_LIMIT = int(os.getenv('ASYNC_PER_HOST_LIMIT', 8))
+
+logger = logging.getLogger(__name__)
+
+def percentile(values, ratio):
+    """Sıralı olmayan bir listeden yaklaşık yüzdelik değeri döndürür."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+def _create_session(concurrency, per_host_limit):
+    """Keep-alive bağlantılarını yeniden kullanan bir aiohttp oturumu oluşturur."""
+    connector = aiohttp.TCPConnector(
+        limit=concurrency,
+        limit_per_host=per_host_limit,
+        keepalive_timeout=30,
+        ttl_dns_cache=300
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+        headers=BROWSER_HEADERS
+    )
+    cookies = dict(trendyol_cookies())
+    if cookies:
+        session.cookie_jar.update_cookies(cookies, response_url=URL('https://www.trendyol.com/'))
+    return session
+
+async def _fetch_product(session, host_limits, per_host_limit, product, index, total, stats, snapshot_class):
+    """Tek bir ürün sayfasını indirir; state verisi çözülmüş PageSnapshot veya None döndürür."""
+    product_url = product.get('product_url', '')
+    host = urlsplit(product_url).netloc
+    if host not in host_limits:
+        host_limits[host] = asyncio.Semaphore(per_host_limit)
+
+    # Eşzamanlılık uçuştaki istek sayısını, RATE_LIMITER ise saniyedeki istek sayısını sınırlar
+    await RATE_LIMITER.acquire_async()
+    async with host_limits[host]:
+        start_time = time.perf_counter()
+        try:
+            async with session.get(product_url) as response:
+                page_source = await response.text()
+                status_code = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            stats['errors'] += 1
+            RATE_LIMITER.record_backoff('network_error')
+            logger.warning(f"HTTP isteği başarısız: {product_url} - {str(e)}")
+            return None
+        finally:
+            stats['latencies'].append(time.perf_counter() - start_time)
+
+    reason = challenge_reason(status_code, None)
+    if not reason:
+        if status_code != 200:
+            stats['errors'] += 1
+            logger.warning(f"HTTP {status_code} yanıtı alındı: {product_url}")
+            return None
+        snapshot = snapshot_class(product_url, html=page_source, source='async')
+        if snapshot.state:
+            RATE_LIMITER.record_success()
+            logger.info(f"İşlendi (async): {index + 1}/{total} - {product.get('product_name', 'Bilinmeyen Ürün')}")
+            return snapshot
+        # Engel işaretlerine sadece state çözülemediğinde bakılır
+        reason = challenge_reason(None, page_source)
+        if not reason:
+            RATE_LIMITER.record_backoff('missing_state')
+            return None
+
+    stats['challenges'] += 1
+    RATE_LIMITER.record_backoff(reason)
+    logger.warning(f"Engel sayfası algılandı (HTTP {status_code}): {product_url}")
+    capture_debug('challenge_page', product_url.rsplit('/', 1)[-1], page_source, failed=True)
+    return None
+
+async def crawl_products_async(products, on_result, build_result, snapshot_class,
+                               concurrency=ASYNC_CONCURRENCY, per_host_limit=ASYNC_PER_HOST_LIMIT):
+    """Ürün listesini sınırlı eşzamanlılıkla tarar.
+
+    Aynı anda en fazla `concurrency` istek, her host için en fazla
+    `per_host_limit` istek uçuşta tutulur. Sayfalar snapshot_class
+    (PageSnapshot) ile sarılır, sonuçlar build_result(snapshot, product)
+    ile oluşturulup hazır olduğunda on_result ile teslim edilir. Teslim
+    edilen sonuç sayısı, HTTP ile alınamayan ürünlerin indeksleri ve tarama
+    raporu döndürülür.
+    """
+    task_queue = asyncio.Queue()
+    for index, product in enumerate(products):
+        task_queue.put_nowait((index, product))
+
+    collected = 0
+    fallback_indices = []
+    host_limits = {}
+    stats = {'latencies': [], 'errors': 0, 'challenges': 0}
+    total = len(products)
+
+    async def worker(session):
+        nonlocal collected
+        while True:
+            try:
+                index, product = task_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            if not product.get('product_url'):
+                logger.error(f"Ürün URL'si bulunamadı: {product.get('product_name', 'Bilinmeyen Ürün')}")
+                continue
+
+            resolve_product_id(product)
+            snapshot = await _fetch_product(session, host_limits, per_host_limit, product, index, total, stats,
+                                            snapshot_class)
+            if snapshot:
+                result = build_result(snapshot, product)
+                if result:
+                    on_result(result)
+                    collected += 1
+            else:
+                fallback_indices.append(index)
+
+    start_time = time.perf_counter()
+    async with _create_session(concurrency, per_host_limit) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(max(1, min(concurrency, total)))]
+        await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start_time
+
+    latencies = stats['latencies']
+    report = {
+        'requests': len(latencies),
+        'elapsed_seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+        'errors': stats['errors'],
+        'challenges': stats['challenges'],
+        'fallbacks': len(fallback_indices),
+        'rate_limit': RATE_LIMITER.metrics()['rate'],
+    }
+    logger.info(
+        f"Async tarama tamamlandı: {report['requests']} istek, {report['requests_per_second']} istek/sn, "
+        f"p50={report['p50_ms']} ms, p95={report['p95_ms']} ms, "
+        f"{report['challenges']} engel, {report['errors']} hata, son hız sınırı {report['rate_limit']:.2f} istek/sn."
+    )
+
+    return collected, sorted(fallback_indices), report
+
+def run_async_crawl(products, on_result, build_result, snapshot_class,
+                    concurrency=ASYNC_CONCURRENCY, per_host_limit=ASYNC_PER_HOST_LIMIT):
+    """crawl_products_async için senkron giriş noktası."""
+    return asyncio.run(crawl_products_async(products, on_result, build_result, snapshot_class,
+                                            concurrency, per_host_limit))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Dashboard tablosunu oluşturan create_price_dataframe için süre ölçümü.
+
+Kullanım:
+    python benchmarks/bench_price_dataframe.py --rows=100000 --competitors=9
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_price_dataframe
+
+def build_data(rows, competitors, legacy_text=False):
+    """Verilen satır sayısına ulaşacak kadar sentetik ürün sonucu üretir.
+
+    legacy_text=True ise sayısal fiyat alanları yazılmaz, fiyatlar metinden çözülür.
+    """
+    random.seed(42)
+    data = []
+    for i in range(rows // (competitors + 1)):
+        product = {
+            'product_id': str(100000 + i),
+            'product_name': f'Ürün {i}',
+            'product_url': f'https://www.trendyol.com/marka/urun-p-{100000 + i}',
+            'product_image': f'https://cdn.dsmcdn.com/{i}.jpg',
+            'my_price': '1.299,90 TL',
+            'last_update': '17.10.2026 10:00:00',
+            'competitors': [],
+        }
+        if not legacy_text:
+            product['my_price_value'] = 1299.9
+        for j in range(competitors):
+            value = round(random.uniform(900, 1600), 2)
+            competitor = {
+                'name': f'Satıcı {j}',
+                'price': f'{value:,.2f} TL'.replace(',', 'X').replace('.', ',').replace('X', '.'),
+                'rating': 9.1,
+            }
+            if not legacy_text:
+                competitor['price_value'] = value
+            product['competitors'].append(competitor)
+        data.append(product)
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description='create_price_dataframe süre ölçümü')
+    parser.add_argument('--rows', type=int, default=100000, help='Toplam satır sayısı')
+    parser.add_argument('--competitors', type=int, default=9, help='Ürün başına rakip sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı')
+    args = parser.parse_args()
+
+    logging.getLogger('app').setLevel(logging.WARNING)
+    for label, legacy_text in (('sayısal fiyat', False), ('metin fiyat (eski kayıt)', True)):
+        data = build_data(args.rows, args.competitors, legacy_text)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            df = create_price_dataframe(data)
+            timings.append(time.perf_counter() - start)
+        print(f"{label:<26} {len(data)} ürün, {len(df)} satır: en iyi {min(timings) * 1000:.0f} ms, "
+              f"ortalama {sum(timings) / len(timings) * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
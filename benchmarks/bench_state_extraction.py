@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Ürün state çıkarımı için eski regex yöntemi ile state_extractor'ı karşılaştırır.
+
+Kullanım:
+    python benchmarks/bench_state_extraction.py --corpus=page_corpus
+    python benchmarks/bench_state_extraction.py --synthetic=50
+
+--corpus dizinindeki her *.html dosyası kaydedilmiş bir ürün sayfası olarak
+okunur. --synthetic verilirse çok megabaytlık sayfalar üretilir; bunların
+yarısında satıcı açıklamaları string içinde '};' içerir.
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from state_extractor import extract_state, USED_STATE_SUBTREES
+
+LEGACY_PATTERN = r'window\.__PRODUCT_DETAIL_APP_INITIAL_STATE__\s*=\s*({.*?});'
+
+def legacy_extract(page_source):
+    """Eski extract_state_from_html davranışı: regex + json.loads."""
+    matches = re.search(LEGACY_PATTERN, page_source, re.DOTALL)
+    if not matches:
+        return None
+    try:
+        return json.loads(matches.group(1))
+    except json.JSONDecodeError:
+        return None
+
+def build_synthetic_page(index, merchant_count=40, padding_kb=1500):
+    """Gerçek sayfaya benzeyen, büyük bir ürün sayfası üretir.
+
+    Çift indeksli sayfalarda bazı satıcı açıklamaları string içinde '};' içerir.
+    """
+    trap = index % 2 == 0
+    merchants = []
+    for i in range(merchant_count):
+        merchants.append({
+            'merchant': {'name': f'Satıcı {i}', 'sellerScore': round(random.uniform(7, 10), 1),
+                         # Eski regex'i erken kesen içerik
+                         'description': 'Kampanya: {"kod": "INDIRIM"}; kargo bedava' if trap and i % 7 == 3 else 'Hızlı kargo'},
+            'price': {'discountedPrice': {'text': f'{random.randint(100, 9999)},{random.randint(0, 99):02d} TL'}},
+        })
+    state = {
+        'product': {
+            'id': index,
+            'name': f'Ürün {index}',
+            'price': {'discountedPrice': {'text': '1.234,56 TL'}},
+            'otherMerchants': merchants,
+            'contentDescriptions': [{'description': 'x' * 200} for _ in range(200)],
+        },
+        'otherMerchants': [],
+        'recommendations': [{'id': i, 'name': f'Öneri {i}', 'image': '/img/' + 'a' * 80} for i in range(500)],
+    }
+    padding = '<div class="filler">' + ('lorem ipsum dolor sit amet ' * (padding_kb * 40)) + '</div>'
+    script = 'window.__PRODUCT_DETAIL_APP_INITIAL_STATE__ = ' + json.dumps(state, ensure_ascii=False) + ';'
+    return f'<html><head><script>var x = 1;</script></head><body>{padding}<script>{script}window.TYPE="product";</script></body></html>'
+
+def load_corpus(corpus_dir):
+    """Dizindeki kaydedilmiş sayfaları okur."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+def run(pages, repeat):
+    """Her yöntemi sayfalar üzerinde çalıştırır ve sonuçları yazdırır."""
+    methods = [
+        ('regex (eski)', legacy_extract),
+        ('raw_decode', extract_state),
+        ('raw_decode + alt ağaç', lambda page: extract_state(page, USED_STATE_SUBTREES)),
+    ]
+    total_mb = sum(len(page) for _, page in pages) / (1024 * 1024)
+    print(f"{len(pages)} sayfa, toplam {total_mb:.1f} MB, {repeat} tekrar")
+
+    reference = {}
+    for name, page in pages:
+        try:
+            reference[name] = extract_state(page)
+        except json.JSONDecodeError:
+            reference[name] = None
+
+    baseline = None
+    for label, method in methods:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs = {}
+            for name, page in pages:
+                try:
+                    outputs[name] = method(page)
+                except json.JSONDecodeError:
+                    outputs[name] = None
+        elapsed = (time.perf_counter() - start) / repeat
+
+        parsed = sum(1 for value in outputs.values() if value is not None)
+        merchants_ok = sum(
+            1 for name, value in outputs.items()
+            if value is not None and reference[name] is not None
+            and value.get('product', {}).get('otherMerchants') == reference[name]['product'].get('otherMerchants')
+        )
+        baseline = baseline or elapsed
+        print(f"  {label:<24} {elapsed * 1000:9.1f} ms  "
+              f"({elapsed * 1000 / max(1, len(pages)):.2f} ms/sayfa, x{baseline / elapsed:.1f})  "
+              f"çözülen: {parsed}/{len(pages)}  tam satıcı listesi: {merchants_ok}/{len(pages)}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Ürün state çıkarımı karşılaştırması')
+    parser.add_argument('--corpus', type=str, default='page_corpus', help='Kaydedilmiş sayfaların dizini')
+    parser.add_argument('--synthetic', type=int, default=0, help='Üretilecek sentetik sayfa sayısı')
+    parser.add_argument('--repeat', type=int, default=3, help='Tekrar sayısı')
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if os.path.isdir(args.corpus) else []
+    if args.synthetic:
+        random.seed(42)
+        pages += [(f'synthetic-{i}.html', build_synthetic_page(i)) for i in range(args.synthetic)]
+    if not pages:
+        print(f"'{args.corpus}' dizininde sayfa bulunamadı; --synthetic ile sayfa üretebilirsiniz.")
+        return
+
+    run(pages, args.repeat)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Her çalışmanın fiyat satırlarını sütunlu (Arrow IPC) dosyalara yazar ve okur.
+
+Dosyalar tarih bölümlerine ayrılır: {SNAPSHOT_DIR}/date=YYYY-MM-DD/run-{run_id}.arrow
+Fiyatlar float64, satıcı ve ürün adları sözlük kodlamalı tutulur. Dosyalar
+sıkıştırılmadan yazıldığı için okurken bellek eşlemesi (memory map) kullanılır.
+pyarrow kurulu değilse yazma/okuma atlanır.
+"""
+
+import os
+import glob
+import time
+import logging
+from datetime import datetime, date
+
+from dotenv import load_dotenv
+
+from price_history import observation_rows
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+    ipc = None
+
+# .env dosyasını yükle
+load_dotenv()
+
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
+
+logger = logging.getLogger(__name__)
+
+def is_available():
+    """pyarrow kurulu mu kontrol eder."""
+    return pa is not None
+
+def _schema():
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('run_id', dictionary),
+        ('product_id', dictionary),
+        ('product_name', dictionary),
+        ('seller', dictionary),
+        ('is_own', pa.bool_()),
+        ('price_text', pa.string()),
+        ('price', pa.float64()),
+        ('rating', pa.float64()),
+        # Epoch saniyesi; saat dilimi bilgisi olmadan UTC olarak tutulur
+        ('observed_at', pa.timestamp('s')),
+        ('product_url', pa.string()),
+        ('product_image', pa.string()),
+    ])
+
+def write_snapshot(results, run_id, snapshot_dir=SNAPSHOT_DIR):
+    """Bir çalışmanın sonuçlarını tek bir Arrow IPC dosyasına yazar.
+
+    results herhangi bir iterable olabilir (örn. günlükten akış). Yazılan
+    dosyanın yolunu döndürür; pyarrow yoksa None döner.
+    """
+    if not is_available():
+        logger.warning("pyarrow kurulu değil, sütunlu anlık görüntü yazılmadı.")
+        return None
+
+    recorded_at = time.time()
+    columns = {name: [] for name in _schema().names}
+    for result in results:
+        if not result.get('product_id'):
+            continue
+        for row in observation_rows(result, run_id, recorded_at):
+            _, product_id, seller, is_own, price_text, price, rating, observed_at = row
+            columns['run_id'].append(run_id)
+            columns['product_id'].append(product_id)
+            columns['product_name'].append(result.get('product_name', ''))
+            columns['seller'].append(seller)
+            columns['is_own'].append(bool(is_own))
+            columns['price_text'].append(price_text)
+            columns['price'].append(price)
+            columns['rating'].append(rating)
+            columns['observed_at'].append(int(observed_at))
+            columns['product_url'].append(result.get('product_url', ''))
+            columns['product_image'].append(result.get('product_image', ''))
+
+    schema = _schema()
+    arrays = []
+    for field in schema:
+        values = columns[field.name]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        elif pa.types.is_timestamp(field.type):
+            arrays.append(pa.array(values, type=pa.int64()).cast(field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    table = pa.Table.from_arrays(arrays, schema=schema)
+
+    partition = os.path.join(snapshot_dir, f"date={datetime.fromtimestamp(recorded_at).strftime('%Y-%m-%d')}")
+    os.makedirs(partition, exist_ok=True)
+    path = os.path.join(partition, f'run-{run_id}.arrow')
+    temp_path = path + '.tmp'
+    with pa.OSFile(temp_path, 'wb') as sink:
+        with ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+    os.replace(temp_path, path)
+
+    logger.info(f"Sütunlu anlık görüntü '{path}' dosyasına yazıldı ({table.num_rows} satır).")
+    return path
+
+def list_snapshots(snapshot_dir=SNAPSHOT_DIR, start=None, end=None):
+    """Tarih aralığındaki (dahil) anlık görüntü dosyalarını eskiden yeniye listeler."""
+    paths = []
+    for partition in sorted(glob.glob(os.path.join(snapshot_dir, 'date=*'))):
+        partition_date = date.fromisoformat(os.path.basename(partition)[len('date='):])
+        if start is not None and partition_date < start:
+            continue
+        if end is not None and partition_date > end:
+            continue
+        paths.extend(sorted(glob.glob(os.path.join(partition, 'run-*.arrow'))))
+    return paths
+
+def _read_table(path):
+    """Arrow IPC dosyasını bellek eşlemesiyle okur."""
+    with pa.memory_map(path, 'r') as source:
+        return ipc.open_file(source).read_all()
+
+def load_latest_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    """En son çalışmanın satırlarını DataFrame olarak döndürür; yoksa None döner."""
+    if not is_available():
+        return None
+    paths = list_snapshots(snapshot_dir)
+    if not paths:
+        return None
+    return _read_table(paths[-1]).to_pandas()
+
+def load_snapshot_range(start, end=None, snapshot_dir=SNAPSHOT_DIR):
+    """Tarih aralığındaki tüm çalışmaların satırlarını tek DataFrame olarak döndürür."""
+    if not is_available():
+        return None
+    paths = list_snapshots(snapshot_dir, start, end)
+    if not paths:
+        return None
+    tables = [_read_table(path) for path in paths]
+    # Her dosyanın sözlüğü farklı olabilir; birleştirirken sözlükler tekleştirilir
+    return pa.concat_tables(tables, promote_options='default').unify_dictionaries().to_pandas()
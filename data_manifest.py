@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Scraper çıktısının sürüm bilgisini (manifest) yazar ve okur.
+
+Her çalışmanın sonunda, tüm çıktılar yazıldıktan sonra küçük bir JSON
+dosyasına çalışma kimliği, satır sayısı ve çıktı dosyasının içerik özeti
+yazılır. Dashboard sadece bu dosyayı izler; sürüm değişmedikçe büyük veri
+dosyalarını okumaz. Tüm yazmalar geçici dosya + os.replace ile atomiktir,
+böylece okuyan taraf hiçbir zaman yarım yazılmış bir dosya görmez.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+DATA_MANIFEST_FILE = os.getenv('DATA_MANIFEST_FILE', 'data_manifest.json')
+
+logger = logging.getLogger(__name__)
+
+def atomic_write_json(path, data, **dump_kwargs):
+    """JSON verisini önce geçici dosyaya yazar, sonra tek adımda hedefin yerine koyar."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Dosyanın SHA-256 özetini parça parça okuyarak hesaplar."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def write_manifest(run_id, row_count, data_file, path=DATA_MANIFEST_FILE, **extra):
+    """Çalışmanın sürüm bilgisini yazar ve manifest sözlüğünü döndürür.
+
+    Sürüm, veri dosyasının içerik özetinden türetilir; içerik aynıysa sürüm
+    de aynı kalır ve dashboard yeniden yükleme yapmaz.
+    """
+    content_hash = file_digest(data_file)
+    manifest = {
+        'version': content_hash[:16],
+        'run_id': run_id,
+        'row_count': row_count,
+        'content_hash': content_hash,
+        'data_file': data_file,
+        'written_at': time.time(),
+    }
+    manifest.update(extra)
+    atomic_write_json(path, manifest, ensure_ascii=False, indent=2)
+    logger.info(f"Veri sürümü '{path}' dosyasına yazıldı: {manifest['version']} ({row_count} ürün, çalışma {run_id}).")
+    return manifest
+
+def read_manifest(path=DATA_MANIFEST_FILE):
+    """Manifest dosyasını okur; yoksa veya bozuksa None döner."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Veri sürümü okunurken hata: {str(e)}")
+        return None
+    return manifest if isinstance(manifest, dict) and manifest.get('version') else None
+
+class ManifestWatcher:
+    """Manifest dosyasını izler; dosya (mtime, boyut) değişmedikçe yeniden okumaz."""
+
+    def __init__(self, path=DATA_MANIFEST_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stat = None
+        self._manifest = None
+
+    def read(self):
+        """Güncel manifest'i döndürür; dosya yoksa None."""
+        try:
+            stat = os.stat(self.path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            key = None
+        with self._lock:
+            if key != self._stat:
+                self._manifest = read_manifest(self.path) if key is not None else None
+                self._stat = key
+            return self._manifest
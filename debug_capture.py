@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""Hata ayıklama için sayfa kaynağı ve hatalı JSON kayıtlarını tutar.
+
+Varsayılan olarak kapalıdır. DEBUG_CAPTURE_MODE ile seçilen moda göre:
+    off      - hiçbir şey kaydedilmez
+    failure  - sadece başarısız sayfalar kaydedilir
+    sample   - başarısız sayfalar ve her N sayfadan biri kaydedilir
+    ring     - tüm sayfalar kaydedilir, sadece son K kayıt tutulur
+İçerik çağıranın thread'inde (sadece kayıt yapılacaksa) alınır, dosyaya
+yazma ise arka plandaki tek bir yazıcı thread'inde yapılır.
+"""
+
+import os
+import re
+import queue
+import atexit
+import logging
+import threading
+from collections import deque
+
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+DEBUG_CAPTURE_MODE = os.getenv('DEBUG_CAPTURE_MODE', 'off').lower()
+DEBUG_CAPTURE_DIR = os.getenv('DEBUG_CAPTURE_DIR', 'debug_captures')
+DEBUG_CAPTURE_SAMPLE_RATE = int(os.getenv('DEBUG_CAPTURE_SAMPLE_RATE', 20))
+DEBUG_CAPTURE_RING_SIZE = int(os.getenv('DEBUG_CAPTURE_RING_SIZE', 20))
+DEBUG_CAPTURE_MODES = ('off', 'failure', 'sample', 'ring')
+
+# Yazıcı geride kalırsa kuyruk dolar ve yeni kayıtlar atılır
+QUEUE_SIZE = 64
+
+logger = logging.getLogger(__name__)
+
+class DebugCapture:
+    """Kayıt kararını verir ve kayıtları arka plan thread'inde diske yazar."""
+
+    def __init__(self, mode=DEBUG_CAPTURE_MODE, directory=DEBUG_CAPTURE_DIR,
+                 sample_rate=DEBUG_CAPTURE_SAMPLE_RATE, ring_size=DEBUG_CAPTURE_RING_SIZE):
+        if mode not in DEBUG_CAPTURE_MODES:
+            logger.warning(f"Bilinmeyen DEBUG_CAPTURE_MODE '{mode}', kayıt kapatıldı.")
+            mode = 'off'
+        self.mode = mode
+        self.directory = directory
+        self.sample_rate = max(1, sample_rate)
+        self.ring_size = max(1, ring_size)
+        self.stats = {'seen': 0, 'captured': 0, 'dropped': 0}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._ring = deque()
+        self._thread = None
+
+    @property
+    def enabled(self):
+        return self.mode != 'off'
+
+    def should_capture(self, failed):
+        """Bu sayfanın kaydedilip kaydedilmeyeceğine karar verir."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            self.stats['seen'] += 1
+            seen = self.stats['seen']
+        if self.mode == 'failure':
+            return failed
+        if self.mode == 'sample':
+            return failed or seen % self.sample_rate == 0
+        return True
+
+    def capture(self, kind, name, content, failed=False, extension='html'):
+        """Gerekiyorsa içeriği kayıt kuyruğuna ekler.
+
+        content bir metin veya metni döndüren bir fonksiyon olabilir; fonksiyon
+        sadece kayıt yapılacaksa çağrılır (örn. lambda: driver.page_source).
+        """
+        if not self.should_capture(failed):
+            return False
+        try:
+            text = content() if callable(content) else content
+        except Exception as e:
+            logger.warning(f"Hata ayıklama içeriği alınamadı ({kind}): {str(e)}")
+            return False
+        if text is None:
+            return False
+
+        with self._lock:
+            self.stats['captured'] += 1
+            sequence = self.stats['captured']
+            if self._thread is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._thread = threading.Thread(target=self._writer, name='debug-capture', daemon=True)
+                self._thread.start()
+
+        safe_name = re.sub(r'[^\w.-]+', '_', str(name))[:80]
+        status = 'failed' if failed else 'ok'
+        file_name = f'{sequence:06d}-{kind}-{safe_name}-{status}.{extension}'
+        try:
+            self._queue.put_nowait((file_name, text))
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+            return False
+        return True
+
+    def _writer(self):
+        """Kuyruktaki kayıtları diske yazar; ring modunda eski kayıtları siler."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                file_name, text = item
+                path = os.path.join(self.directory, file_name)
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                if self.mode == 'ring':
+                    self._ring.append(path)
+                    while len(self._ring) > self.ring_size:
+                        old_path = self._ring.popleft()
+                        try:
+                            os.remove(old_path)
+                        except OSError:
+                            pass
+            except Exception as e:
+                logger.error(f"Hata ayıklama kaydı yazılırken hata: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        """Kuyruktaki kayıtlar yazılana kadar bekler ve yazıcıyı durdurur."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+        logger.info(
+            f"Hata ayıklama kaydı ({self.mode}): {self.stats['captured']} kayıt "
+            f"'{self.directory}' dizinine yazıldı, {self.stats['dropped']} kayıt atıldı."
+        )
+
+DEBUG_CAPTURE = DebugCapture()
+atexit.register(DEBUG_CAPTURE.close)
+
+def capture_debug(kind, name, content, failed=False, extension='html'):
+    """Paylaşılan DebugCapture örneğine kayıt ekler."""
+    return DEBUG_CAPTURE.capture(kind, name, content, failed, extension)
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""Gözlemlenen fiyatları zaman serisi olarak saklayan SQLite deposu.
+
+Her çalışmada görülen (ürün, satıcı, fiyat, puan, zaman) satırları WAL
+modunda, toplu eklemelerle kaydedilir. Son anlık görüntü, ürün geçmişi ve
+belirli bir andan beri değişen fiyatlar indeksli sorgularla okunur.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from price_parser import parse_price_value
+
+# .env dosyasını yükle
+load_dotenv()
+
+PRICE_HISTORY_DB = os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+OWN_SELLER = 'Kendi Mağazam'
+BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    product_count INTEGER NOT NULL,
+    row_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    product_id TEXT PRIMARY KEY,
+    product_name TEXT,
+    product_url TEXT,
+    product_image TEXT,
+    last_seen_run TEXT,
+    last_observed_run TEXT
+);
+CREATE TABLE IF NOT EXISTS observations (
+    run_id TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    seller TEXT NOT NULL,
+    is_own INTEGER NOT NULL,
+    price_text TEXT,
+    price REAL,
+    rating REAL,
+    observed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_observations_run ON observations (run_id);
+CREATE INDEX IF NOT EXISTS idx_observations_run_product ON observations (run_id, product_id);
+CREATE INDEX IF NOT EXISTS idx_observations_product_seller_time ON observations (product_id, seller, observed_at);
+CREATE INDEX IF NOT EXISTS idx_observations_time ON observations (observed_at);
+"""
+
+def connect(db_path=PRICE_HISTORY_DB):
+    """Veritabanına WAL modunda bağlanır ve şemayı oluşturur."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    _migrate(conn)
+    return conn
+
+def _migrate(conn):
+    """Eski veritabanlarına sonradan eklenen sütunları ekler.
+
+    last_seen_run: ürünün katalogda görüldüğü son çalışma.
+    last_observed_run: ürünün gözlem satırlarının yazıldığı son çalışma.
+    Eski veritabanlarında ikisi de ürünün en son gözlendiği çalışma olur.
+    """
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(products)')}
+    missing = [column for column in ('last_seen_run', 'last_observed_run') if column not in columns]
+    if not missing:
+        return
+    # Çalışma başına ürünler indeksten tek geçişte okunur; son çalışma Python'da seçilir
+    recorded = {row['run_id']: row['recorded_at'] for row in conn.execute('SELECT run_id, recorded_at FROM runs')}
+    latest = {}
+    for row in conn.execute('SELECT DISTINCT run_id, product_id FROM observations'):
+        current = latest.get(row['product_id'])
+        if current is None or recorded.get(row['run_id'], 0) > recorded.get(current, 0):
+            latest[row['product_id']] = row['run_id']
+    with conn:
+        for column in missing:
+            conn.execute(f'ALTER TABLE products ADD COLUMN {column} TEXT')
+            conn.executemany(f'UPDATE products SET {column} = ? WHERE product_id = ?',
+                             [(run_id, product_id) for product_id, run_id in latest.items()])
+
+def _parse_timestamp(last_update, default):
+    """Sonuçtaki 'dd.mm.yyyy HH:MM:SS' zamanını epoch'a çevirir."""
+    if last_update:
+        try:
+            return datetime.strptime(last_update, "%d.%m.%Y %H:%M:%S").timestamp()
+        except ValueError:
+            pass
+    return default
+
+def _price_value(item, key, price_text):
+    """Tarama sırasında kaydedilen sayısal fiyatı döndürür; eski kayıtlarda metni çözer."""
+    if key in item:
+        return item[key]
+    return parse_price_value(price_text)
+
+def observation_rows(result, run_id, recorded_at):
+    """Bir ürün sonucundan gözlem satırlarını üretir."""
+    product_id = str(result['product_id'])
+    observed_at = _parse_timestamp(result.get('last_update'), recorded_at)
+
+    my_price = result.get('my_price', '')
+    if isinstance(my_price, dict):
+        my_price = my_price.get('text', '')
+    yield (run_id, product_id, OWN_SELLER, 1, my_price, _price_value(result, 'my_price_value', my_price), None, observed_at)
+
+    for competitor in result.get('competitors', []):
+        price_text = competitor.get('price', '')
+        if isinstance(price_text, dict):
+            price_text = price_text.get('text', '')
+        rating = competitor.get('rating')
+        yield (
+            run_id, product_id, competitor.get('name', 'Bilinmeyen Satıcı'), 0,
+            price_text, _price_value(competitor, 'price_value', price_text),
+            float(rating) if isinstance(rating, (int, float)) else None,
+            observed_at
+        )
+
+def record_run(results, run_id, db_path=PRICE_HISTORY_DB, retained_ids=None):
+    """Bir çalışmanın sonuçlarını toplu eklemelerle kaydeder.
+
+    results herhangi bir iterable olabilir (örn. günlükten akış); satırlar
+    BATCH_SIZE'lık gruplar halinde yazılır. retained_ids, bu çalışmada
+    taranmayıp önceki sonucu korunan ürünlerdir (artımlı mod); bunlar için
+    gözlem satırı yazılmaz, gözlemleri önceki çalışmada zaten kayıtlıdır.
+    Eklenen satır sayısını döndürür.
+    """
+    recorded_at = time.time()
+    retained_ids = {str(product_id) for product_id in retained_ids or ()}
+    conn = connect(db_path)
+    product_count = 0
+    retained_count = 0
+    row_count = 0
+    observations = []
+    products = []
+    try:
+        with conn:
+            for result in results:
+                if not result.get('product_id'):
+                    continue
+                product_count += 1
+                retained = str(result['product_id']) in retained_ids
+                products.append((
+                    str(result['product_id']), result.get('product_name', ''),
+                    result.get('product_url', ''), result.get('product_image', ''), run_id,
+                    None if retained else run_id
+                ))
+                if retained:
+                    retained_count += 1
+                else:
+                    observations.extend(observation_rows(result, run_id, recorded_at))
+
+                if len(observations) >= BATCH_SIZE or len(products) >= BATCH_SIZE:
+                    row_count += _flush(conn, observations, products)
+
+            row_count += _flush(conn, observations, products)
+            conn.execute(
+                'INSERT OR REPLACE INTO runs (run_id, recorded_at, product_count, row_count) VALUES (?, ?, ?, ?)',
+                (run_id, recorded_at, product_count, row_count)
+            )
+    finally:
+        conn.close()
+
+    logger.info(f"Fiyat geçmişine {product_count} ürün, {row_count} satır kaydedildi "
+                f"({retained_count} ürün önceki gözlemleriyle korundu, çalışma {run_id}).")
+    return row_count
+
+def _flush(conn, observations, products):
+    """Biriken satırları tek executemany ile yazar ve listeleri boşaltır.
+
+    Korunan ürünlerde last_observed_run None verilir; önceki değer kalır.
+    """
+    count = len(observations)
+    if products:
+        conn.executemany(
+            'INSERT INTO products (product_id, product_name, product_url, product_image, last_seen_run, '
+            'last_observed_run) VALUES (?, ?, ?, ?, ?, ?) '
+            'ON CONFLICT(product_id) DO UPDATE SET product_name=excluded.product_name, '
+            'product_url=excluded.product_url, product_image=excluded.product_image, '
+            'last_seen_run=excluded.last_seen_run, '
+            'last_observed_run=COALESCE(excluded.last_observed_run, products.last_observed_run)',
+            products
+        )
+    if observations:
+        conn.executemany(
+            'INSERT INTO observations (run_id, product_id, seller, is_own, price_text, price, rating, observed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            observations
+        )
+    observations.clear()
+    products.clear()
+    return count
+
+def latest_run_id(conn):
+    """Son kaydedilen çalışmanın kimliğini döndürür."""
+    row = conn.execute('SELECT run_id FROM runs ORDER BY recorded_at DESC LIMIT 1').fetchone()
+    return row['run_id'] if row else None
+
+def latest_snapshot(db_path=PRICE_HISTORY_DB):
+    """Son çalışmanın sonuçlarını COMPETITOR_DATA_FILE formatında döndürür.
+
+    Son çalışmanın kataloğundaki her ürün için ürünün en son gözlendiği
+    çalışmanın satırları kullanılır; artımlı modda korunan ürünler de dahildir.
+    """
+    conn = connect(db_path)
+    try:
+        run_id = latest_run_id(conn)
+        if run_id is None:
+            return []
+
+        # CROSS JOIN, planlayıcının observations tablosunu rowid sırasıyla taramasını önler;
+        # her ürünün satırları (run_id, product_id) indeksinden okunur
+        rows = conn.execute(
+            'SELECT o.product_id, o.seller, o.is_own, o.price_text, o.price, o.rating, o.observed_at, '
+            'p.product_name, p.product_url, p.product_image '
+            'FROM products p CROSS JOIN observations o '
+            'ON o.run_id = p.last_observed_run AND o.product_id = p.product_id '
+            'WHERE p.last_seen_run = ? ORDER BY o.rowid',
+            (run_id,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    snapshot = {}
+    for row in rows:
+        product = snapshot.get(row['product_id'])
+        if product is None:
+            product = snapshot[row['product_id']] = {
+                'product_id': row['product_id'],
+                'product_name': row['product_name'],
+                'product_image': row['product_image'],
+                'product_url': row['product_url'],
+                'my_price': '',
+                'competitors': [],
+                'last_update': datetime.fromtimestamp(row['observed_at']).strftime("%d.%m.%Y %H:%M:%S")
+            }
+        if row['is_own']:
+            product['my_price'] = row['price_text']
+            product['my_price_value'] = row['price']
+        else:
+            product['competitors'].append({
+                'name': row['seller'],
+                'price': row['price_text'],
+                'price_value': row['price'],
+                'rating': row['rating'] if row['rating'] is not None else 0
+            })
+    return list(snapshot.values())
+
+def product_history(product_id, db_path=PRICE_HISTORY_DB, seller=None):
+    """Bir ürünün (isteğe bağlı olarak tek satıcının) fiyat geçmişini zamana göre döndürür."""
+    conn = connect(db_path)
+    try:
+        query = ('SELECT run_id, seller, is_own, price_text, price, rating, observed_at '
+                 'FROM observations WHERE product_id = ?')
+        params = [str(product_id)]
+        if seller is not None:
+            query += ' AND seller = ?'
+            params.append(seller)
+        query += ' ORDER BY observed_at, seller'
+        return [dict(row) for row in conn.execute(query, params)]
+    finally:
+        conn.close()
+
+def price_changes_since(since, db_path=PRICE_HISTORY_DB):
+    """Verilen andan (epoch) beri fiyatı değişen (ürün, satıcı) gözlemlerini döndürür.
+
+    Her gözlem, aynı satıcının bir önceki gözlemiyle karşılaştırılır.
+    """
+    if isinstance(since, datetime):
+        since = since.timestamp()
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(
+            'SELECT * FROM ('
+            '  SELECT o.product_id, o.seller, o.is_own, o.observed_at, o.price, ('
+            '    SELECT prev.price FROM observations prev'
+            '    WHERE prev.product_id = o.product_id AND prev.seller = o.seller AND prev.observed_at < o.observed_at'
+            '    ORDER BY prev.observed_at DESC LIMIT 1'
+            '  ) AS previous_price'
+            '  FROM observations o WHERE o.observed_at >= ?'
+            ') WHERE previous_price IS NOT NULL AND price IS NOT NULL AND price != previous_price '
+            'ORDER BY observed_at',
+            (since,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    finally:
+        conn.close()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Türkçe fiyat metinlerini ('1.234,56 TL', '₺99,90', '1.250 TL') sayıya çevirir.
+
+Tek değerler için önbellekli parse_price, tüm sütunlar için pandas ile
+vektörel parse_price_series kullanılır. Her iki yol da aynı kuralları uygular:
+virgül ondalık ayırıcıdır, nokta binlik ayırıcıdır; virgül yoksa ve nokta
+binlik grubu gibi görünmüyorsa (örn. '1234.5') ondalık kabul edilir.
+"""
+
+import re
+from functools import lru_cache
+
+CURRENCY_SYMBOLS = {'TL': 'TRY', '₺': 'TRY', 'TRY': 'TRY', 'USD': 'USD', '$': 'USD', 'EUR': 'EUR', '€': 'EUR'}
+
+NUMBER_PATTERN = r'(\d[\d.,\s]*\d|\d)'
+THOUSANDS_PATTERN = r'\d{1,3}(?:\.\d{3})+'
+CURRENCY_PATTERN = r'(TL|₺|TRY|USD|\$|EUR|€)'
+
+_number_re = re.compile(NUMBER_PATTERN)
+_thousands_re = re.compile(THOUSANDS_PATTERN)
+_currency_re = re.compile(CURRENCY_PATTERN)
+
+def _normalize_number(number):
+    """Sayı parçasını float'a çevrilebilir biçime getirir."""
+    number = re.sub(r'\s', '', number)
+    if ',' in number or _thousands_re.fullmatch(number):
+        return number.replace('.', '').replace(',', '.')
+    return number
+
+@lru_cache(maxsize=65536)
+def _parse_text(text):
+    match = _number_re.search(text)
+    value = None
+    if match:
+        try:
+            value = float(_normalize_number(match.group(1)))
+        except ValueError:
+            value = None
+    currency_match = _currency_re.search(text)
+    currency = CURRENCY_SYMBOLS[currency_match.group(1)] if currency_match else None
+    return value, currency
+
+def parse_price(price):
+    """Fiyatı (değer, para birimi) olarak döndürür; çevrilemeyen kısımlar None olur.
+
+    Metin fiyatlar dışında {'text': ...} sözlükleri ve sayılar da kabul edilir.
+    """
+    if isinstance(price, dict):
+        price = price.get('text', '')
+    if isinstance(price, bool):
+        return None, None
+    if isinstance(price, (int, float)):
+        return float(price), None
+    if not price or not isinstance(price, str):
+        return None, None
+    return _parse_text(price)
+
+def parse_price_value(price):
+    """Fiyatın sayısal değerini döndürür; çevrilemezse None döner."""
+    return parse_price(price)[0]
+
+def parse_price_series(values):
+    """Fiyat metni/sayısı içeren bir sütunu float64 Series'e çevirir (çevrilemeyenler NaN)."""
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.astype('float64')
+
+    series = series.astype('object')
+    # .str erişimi metin olmayan hücreler için NaN döndürür
+    is_text = series.str.len().notna()
+    number = series.str.extract(NUMBER_PATTERN, expand=False).str.replace(r'\s', '', regex=True)
+    turkish = number.str.contains(',', regex=False, na=False) | number.str.fullmatch(THOUSANDS_PATTERN, na=False)
+    number = number.where(~turkish, number.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    parsed = pd.to_numeric(number, errors='coerce')
+
+    other = pd.to_numeric(series.where(~is_text), errors='coerce')
+    return parsed.where(is_text, other).astype('float64')
+
+def parse_currency_series(values):
+    """Fiyat metinlerinden para birimi kodlarını çıkarır (bulunamayanlar None)."""
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    symbols = series.astype('object').str.extract(CURRENCY_PATTERN, expand=False)
+    return symbols.map(CURRENCY_SYMBOLS)
@@ -2,10 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import os
+import sys
 import time
 import json
 import logging
 import glob
+import queue
+import threading
+import requests
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
@@ -13,10 +17,22 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from dotenv import load_dotenv
 import re
 import argparse
 from datetime import datetime
+from urllib.parse import urljoin
+from fnmatch import fnmatch
+from state_extractor import extract_state, state_source_snippet, USED_STATE_SUBTREES
+from raw_archive import RawArchive, canonical_bytes
+from price_parser import parse_price
+from debug_capture import DEBUG_CAPTURE, DEBUG_CAPTURE_MODES, capture_debug
+from data_manifest import DATA_MANIFEST_FILE, atomic_write_json, write_manifest
+from scrape_jobs import ProgressReporter
+from rate_limiter import RATE_LIMITER, challenge_reason
+from trendyol_http import (TRENDYOL_COOKIES, HTTP_TIMEOUT_SECONDS, USER_AGENT, parse_cookie_string,
+                           create_http_session, resolve_product_id)
 
 # .env dosyasını yükle
 load_dotenv()
@@ -24,15 +40,59 @@ load_dotenv()
 # Dosya yolları
 PRODUCTS_FILE = os.getenv('PRODUCTS_FILE', 'products.json')
 COMPETITOR_DATA_FILE = os.getenv('COMPETITOR_DATA_FILE', 'all_competitor_prices.json')
+# Sonuçların işlendikçe eklendiği günlük (JSONL)
+COMPETITOR_JOURNAL_FILE = os.getenv('COMPETITOR_JOURNAL_FILE', os.path.splitext(COMPETITOR_DATA_FILE)[0] + '.jsonl')
+# Fiyat geçmişi veritabanı (boş bırakılırsa geçmiş tutulmaz)
+PRICE_HISTORY_DB = os.getenv('PRICE_HISTORY_DB', 'price_history.db')
+# Sütunlu (Arrow) anlık görüntü dizini; boş bırakılırsa yazılmaz
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', 'snapshots')
 PRODUCT_DATA_DIR = os.getenv('PRODUCT_DATA_DIR', 'product_data')
+# Ham ürün verisinin sıkıştırılmış arşivi (boş bırakılırsa ham veri saklanmaz)
+RAW_ARCHIVE_DIR = os.getenv('RAW_ARCHIVE_DIR', 'raw_archive')
+FETCH_INDEX_FILE = os.path.join(PRODUCT_DATA_DIR, 'fetch_index.json')
+# Dashboard'dan başlatılan işlerde ilerlemenin yazılacağı dosya (iş yöneticisi ayarlar)
+SCRAPE_PROGRESS_FILE = os.getenv('SCRAPE_PROGRESS_FILE', '')
+
+# Artımlı tarama: bu süreden (saat) yeni ürünler yeniden taranmaz
+FRESHNESS_TTL_HOURS = float(os.getenv('FRESHNESS_TTL_HOURS', 24))
 
 # Trendyol ayarları
 TRENDYOL_SHOP_URL = os.getenv('TRENDYOL_SHOP_URL', 'https://www.trendyol.com/sr?mid=1010350&os=1')
-TRENDYOL_COOKIES = os.getenv('TRENDYOL_COOKIES', '')
+# Çoklu mağaza modu: virgülle ayrılmış mağaza URL'leri veya satıcı (merchant) id'leri
+TRENDYOL_SHOP_URLS = os.getenv('TRENDYOL_SHOP_URLS', '')
+# Çoklu mağaza modunda mağaza bazlı çıktıların dizini (<dizin>/<mağaza>/...)
+SHOPS_OUTPUT_DIR = os.getenv('SHOPS_OUTPUT_DIR', 'shops')
+
+# Veri çekme modu: 'browser' (Selenium) veya 'http' (tarayıcısız, gerekirse Selenium'a düşer)
+FETCH_MODE = os.getenv('FETCH_MODE', 'browser')
+# Liste sayfası kart okuma yöntemi: script, soup veya element
+CARD_EXTRACTION_MODE = os.getenv('CARD_EXTRACTION_MODE', 'script')
+
+# Hafif tarayıcı profili: resim, font, medya ve takip betikleri engellenir
+LEAN_PROFILE = os.getenv('LEAN_PROFILE', 'false').lower() in ('1', 'true', 'yes')
+LEAN_BLOCK_PATTERNS = [
+    # Resimler
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    # Fontlar
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    # Medya
+    '*.mp4', '*.webm', '*.m3u8', '*.mp3',
+    # Analitik ve reklam
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*', '*clarity.ms*', '*criteo.com*',
+    '*criteo.net*', '*useinsider.com*', '*adjust.com*', '*newrelic.com*', '*nr-data.net*', '*tiktok.com*',
+]
+LEAN_EXTRA_BLOCK_PATTERNS = [p.strip() for p in os.getenv('LEAN_BLOCK_PATTERNS', '').split(',') if p.strip()]
+LEAN_ALLOW_PATTERNS = [p.strip() for p in os.getenv('LEAN_ALLOW_PATTERNS', '').split(',') if p.strip()]
+
+# Ürün state verisinden sadece kullanılan alt ağaçları (fiyat, diğer satıcılar) al
+STATE_SUBTREES_ONLY = os.getenv('STATE_SUBTREES_ONLY', 'false').lower() in ('1', 'true', 'yes')
+# Normal profilde ölçülen sayfa başına trafik; hafif profildeki tasarruf buna göre hesaplanır
+TRAFFIC_BASELINE_FILE = os.getenv('TRAFFIC_BASELINE_FILE', 'traffic_baseline.json')
 
 # Bekleme ayarları
-WAIT_AFTER_PRODUCTS = int(os.getenv('WAIT_AFTER_PRODUCTS', 5))
-WAIT_TIME_SECONDS = int(os.getenv('WAIT_TIME_SECONDS', 5))
+PAGE_READY_TIMEOUT = float(os.getenv('PAGE_READY_TIMEOUT', 15))
+# İstek hızı rate_limiter modülündeki uyarlanabilir sınırlayıcı ile ayarlanır (RATE_LIMIT_*)
 
 # Logging ayarları
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -45,8 +105,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def setup_driver():
-    """Selenium WebDriver'ı başlatır."""
+def build_blocked_url_patterns(block_patterns=None, allow_patterns=None):
+    """Hafif profil için engellenecek URL desenlerini oluşturur.
+    
+    Varsayılan desenlere LEAN_BLOCK_PATTERNS eklenir; LEAN_ALLOW_PATTERNS ile
+    eşleşen desenler listeden çıkarılır (örn: '*.svg' veya '*useinsider.com*').
+    """
+    block_patterns = LEAN_BLOCK_PATTERNS + LEAN_EXTRA_BLOCK_PATTERNS if block_patterns is None else block_patterns
+    allow_patterns = LEAN_ALLOW_PATTERNS if allow_patterns is None else allow_patterns
+    patterns = []
+    for pattern in block_patterns:
+        if any(fnmatch(pattern, allowed) for allowed in allow_patterns):
+            continue
+        if pattern not in patterns:
+            patterns.append(pattern)
+    return patterns
+
+def setup_driver(lean=LEAN_PROFILE):
+    """Selenium WebDriver'ı başlatır.
+    
+    lean=True ise resim, font, medya ve takip betikleri CDP
+    Network.setBlockedURLs ile engellenir.
+    """
     try:
         # Chrome ayarlarını yapılandır
         chrome_options = Options()
@@ -63,6 +143,12 @@ def setup_driver():
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
         
+        # Ağ olayları trafik ölçümü için iki profilde de loglanır
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        if lean:
+            # Resimleri içerik ayarından da kapat
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        
         # Headless modu (opsiyonel)
         # chrome_options.add_argument("--headless")
         
@@ -76,7 +162,14 @@ def setup_driver():
         # Chrome tarayıcısını başlat
         driver = webdriver.Chrome(service=service, options=chrome_options)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'})
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {"userAgent": USER_AGENT})
+        
+        driver.lean_profile = lean
+        if lean:
+            blocked_patterns = build_blocked_url_patterns()
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_patterns})
+            logger.info(f"Hafif profil etkin: {len(blocked_patterns)} URL deseni engelleniyor.")
         
         return driver
     except Exception as e:
@@ -85,6 +178,117 @@ def setup_driver():
         logger.error(traceback.format_exc())
         raise
 
+# Bu çalışmanın ham veri arşivi (process_all_products içinde açılır)
+RAW_ARCHIVE = None
+
+# Bu çalışmada state verisi alınan ürünlerin tarama zamanları
+FETCH_TIMESTAMPS = {}
+_fetch_index_lock = threading.Lock()
+
+# Profil başına sayfa trafiği istatistikleri ('lean' / 'normal')
+TRAFFIC_STATS = {profile: {'pages': 0, 'bytes': 0, 'requests': 0, 'blocked': 0, 'blocked_by_type': {}}
+                 for profile in ('lean', 'normal')}
+_traffic_lock = threading.Lock()
+
+def measure_page_traffic(driver):
+    """Son sayfa yüklemesinin ağ trafiğini performans logundan ölçer.
+    
+    İndirilen bayt, tamamlanan istek ve engellenen istek sayılarını döndürür.
+    Engellenen istekler hiç indirilmediği için boyutları bilinmez; bayt
+    tasarrufu log_traffic_stats'ta normal profilin ortalamasıyla karşılaştırılır.
+    """
+    try:
+        entries = driver.get_log('performance')
+    except Exception as e:
+        logger.debug(f"Performans logu okunamadı: {str(e)}")
+        return None
+    
+    transferred = 0
+    finished = 0
+    blocked = 0
+    blocked_by_type = {}
+    resource_types = {}
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        method = message.get('method')
+        params = message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            resource_types[params.get('requestId')] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            transferred += int(params.get('encodedDataLength', 0))
+            finished += 1
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            blocked += 1
+            resource_type = params.get('type') or resource_types.get(params.get('requestId'), 'Other')
+            blocked_by_type[resource_type] = blocked_by_type.get(resource_type, 0) + 1
+    
+    stats = TRAFFIC_STATS['lean' if getattr(driver, 'lean_profile', False) else 'normal']
+    with _traffic_lock:
+        stats['pages'] += 1
+        stats['bytes'] += transferred
+        stats['requests'] += finished
+        stats['blocked'] += blocked
+        for resource_type, count in blocked_by_type.items():
+            stats['blocked_by_type'][resource_type] = stats['blocked_by_type'].get(resource_type, 0) + count
+    
+    logger.info(f"Sayfa trafiği: {transferred / 1024:.0f} KB indirildi, {finished} istek, {blocked} istek engellendi {blocked_by_type}")
+    return {'bytes': transferred, 'requests': finished, 'blocked': blocked, 'blocked_by_type': blocked_by_type}
+
+def load_traffic_baseline():
+    """Normal profilde ölçülen sayfa başına ortalama baytı yükler; yoksa None."""
+    if not TRAFFIC_BASELINE_FILE or not os.path.exists(TRAFFIC_BASELINE_FILE):
+        return None
+    try:
+        with open(TRAFFIC_BASELINE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('bytes_per_page')
+    except Exception as e:
+        logger.error(f"Trafik referansı yüklenirken hata: {str(e)}")
+        return None
+
+def log_traffic_stats():
+    """Profil başına trafik istatistiklerini ve hafif profilin sayfa başına bayt tasarrufunu loglar.
+    
+    Normal profilde ölçülen ortalama TRAFFIC_BASELINE_FILE dosyasına yazılır;
+    hafif profil bu referansla karşılaştırılır.
+    """
+    with _traffic_lock:
+        snapshot = {profile: dict(stats, blocked_by_type=dict(stats['blocked_by_type']))
+                    for profile, stats in TRAFFIC_STATS.items()}
+    
+    normal = snapshot['normal']
+    baseline = None
+    if normal['pages']:
+        baseline = normal['bytes'] / normal['pages']
+        if TRAFFIC_BASELINE_FILE:
+            try:
+                atomic_write_json(TRAFFIC_BASELINE_FILE, {'bytes_per_page': baseline, 'pages': normal['pages'],
+                                                          'updated_at': time.time()})
+            except Exception as e:
+                logger.error(f"Trafik referansı kaydedilirken hata: {str(e)}")
+    
+    for profile, stats in snapshot.items():
+        pages = stats['pages']
+        if not pages:
+            continue
+        logger.info(
+            f"Sayfa trafiği ({profile}): {pages} sayfa, sayfa başına ortalama {stats['bytes'] / pages / 1024:.0f} KB "
+            f"ve {stats['requests'] / pages:.0f} istek, sayfa başına {stats['blocked'] / pages:.0f} "
+            f"istek engellendi {stats['blocked_by_type']}"
+        )
+    
+    lean = snapshot['lean']
+    if lean['pages']:
+        baseline = baseline or load_traffic_baseline()
+        if baseline:
+            saved = baseline - lean['bytes'] / lean['pages']
+            logger.info(f"Hafif profil sayfa başına {saved / 1024:.0f} KB tasarruf etti "
+                        f"(%{saved / baseline * 100:.0f}, normal profil ortalaması {baseline / 1024:.0f} KB).")
+        else:
+            logger.info("Bayt tasarrufu için referans yok; bir kez --lean olmadan çalıştırın.")
+
 def add_cookies(driver):
     """Tarayıcıya çerezleri ekler."""
     if not TRENDYOL_COOKIES:
@@ -92,41 +296,103 @@ def add_cookies(driver):
         return
     
     # Çerezleri ayır ve ekle
-    cookies_str = TRENDYOL_COOKIES
-    cookie_pairs = cookies_str.split(';')
-    
-    for cookie_pair in cookie_pairs:
-        if '=' in cookie_pair:
-            name, value = cookie_pair.strip().split('=', 1)
-            try:
-                # Önce sayfayı yükle, sonra çerezleri ekle
-                current_url = driver.current_url
-                domain = '.trendyol.com'
-                if 'trendyol.com' in current_url:
-                    driver.add_cookie({'name': name, 'value': value, 'domain': domain})
-            except Exception as e:
-                logger.error(f"Çerez eklenirken hata oluştu: {str(e)}")
+    for name, value in parse_cookie_string(TRENDYOL_COOKIES):
+        try:
+            # Önce sayfayı yükle, sonra çerezleri ekle
+            current_url = driver.current_url
+            domain = '.trendyol.com'
+            if 'trendyol.com' in current_url:
+                driver.add_cookie({'name': name, 'value': value, 'domain': domain})
+        except Exception as e:
+            logger.error(f"Çerez eklenirken hata oluştu: {str(e)}")
     
     logger.info("Çerezler tarayıcıya eklendi.")
 
-def get_products_from_shop(driver, page_limit=1):
-    """Mağaza sayfasından ürünleri çeker."""
+# Sayfa hazır olma koşulları (tek bir execute_script çağrısı ile kontrol edilir)
+PAGE_READY_SCRIPTS = {
+    'document': "return document.readyState === 'complete'",
+    'grid': "return document.querySelector(arguments[0]) !== null",
+    'product_state': "return !!window.__PRODUCT_DETAIL_APP_INITIAL_STATE__",
+}
+
+# Bekleme süreleri istatistikleri: {tür: {'count', 'total', 'max', 'timeouts'}}
+PAGE_WAIT_STATS = {}
+_page_wait_lock = threading.Lock()
+
+def record_page_wait(kind, elapsed, ready):
+    """Bir bekleme süresini istatistiklere ekler."""
+    with _page_wait_lock:
+        stats = PAGE_WAIT_STATS.setdefault(kind, {'count': 0, 'total': 0.0, 'max': 0.0, 'timeouts': 0})
+        stats['count'] += 1
+        stats['total'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+        if not ready:
+            stats['timeouts'] += 1
+
+def log_run_stats():
+    """Sayfa bekleme, trafik ve sayfa verisi istatistiklerini loglar."""
+    log_page_wait_stats()
+    log_traffic_stats()
+    log_snapshot_stats()
+    RATE_LIMITER.log_metrics()
+
+def log_page_wait_stats():
+    """Sayfa bekleme istatistiklerini loglar."""
+    with _page_wait_lock:
+        for kind, stats in PAGE_WAIT_STATS.items():
+            average = stats['total'] / stats['count'] if stats['count'] else 0.0
+            logger.info(
+                f"Sayfa bekleme ({kind}): {stats['count']} sayfa, ortalama {average:.2f} sn, "
+                f"en fazla {stats['max']:.2f} sn, {stats['timeouts']} zaman aşımı"
+            )
+
+def wait_for_page_ready(driver, kind, timeout=None):
+    """Sayfa hazır olana kadar bekler ve geçen süreyi kaydeder.
+    
+    kind: 'document' (yükleme tamamlandı), 'grid' (ürün kartları görünür) veya
+    'product_state' (__PRODUCT_DETAIL_APP_INITIAL_STATE__ tanımlı).
+    Zaman aşımında False döner; çağıran akış devam eder.
+    """
+    timeout = PAGE_READY_TIMEOUT if timeout is None else timeout
+    script = PAGE_READY_SCRIPTS[kind]
+    args = [', '.join(CARD_SELECTORS)] if kind == 'grid' else []
+    
+    start_time = time.time()
+    ready = True
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(lambda d: d.execute_script(script, *args))
+    except TimeoutException:
+        ready = False
+        logger.warning(f"Sayfa {timeout:g} saniye içinde hazır olmadı ({kind}): {driver.current_url}")
+    elapsed = time.time() - start_time
+    
+    record_page_wait(kind, elapsed, ready)
+    logger.debug(f"Sayfa hazır ({kind}): {elapsed:.2f} sn")
+    return ready
+
+def get_products_from_shop(driver, shop_url=None, page_limit=1, card_extraction=CARD_EXTRACTION_MODE, listing_workers=1,
+                           products_file=PRODUCTS_FILE):
+    """Mağaza sayfasından ürünleri çeker ve products_file dosyasına kaydeder.
+    
+    shop_url verilmezse TRENDYOL_SHOP_URL kullanılır. listing_workers > 1 ise
+    ilk sayfadan sonraki liste sayfaları HTTP ile eşzamanlı çekilir;
+    alınamayan sayfalar tarayıcıyla taranır.
+    """
+    shop_url = shop_url or TRENDYOL_SHOP_URL
     try:
-        logger.info(f"Mağaza URL'si açılıyor: {TRENDYOL_SHOP_URL}")
-        driver.get(TRENDYOL_SHOP_URL)
-        time.sleep(5)  # Sayfanın yüklenmesi için bekle
+        logger.info(f"Mağaza URL'si açılıyor: {shop_url}")
+        RATE_LIMITER.acquire()
+        driver.get(shop_url)
+        wait_for_page_ready(driver, 'document')  # Çerez eklemek için domain yüklenmeli
         
         # Sayfayı açtıktan sonra çerezleri ekle
         add_cookies(driver)
         
         # Sayfayı yenile
+        RATE_LIMITER.acquire()
         driver.refresh()
-        time.sleep(5)  # Yenileme sonrası sayfanın yüklenmesi için bekle
-        
-        # Sayfa kaynağını kaydet
-        with open('page_source.html', 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
-        logger.info("Sayfa kaynağı 'page_source.html' dosyasına kaydedildi.")
+        wait_for_page_ready(driver, 'grid')  # Ürün kartları görünene kadar bekle
+        measure_page_traffic(driver)
         
         # Toplam ürün sayısını bul
         total_products = 0
@@ -144,8 +410,6 @@ def get_products_from_shop(driver, page_limit=1):
         except Exception as e:
             logger.warning(f"Toplam ürün sayısı bulunamadı: {str(e)}")
         
-        all_products = []
-        current_page = 1
         max_pages = (total_products + 23) // 24  # Her sayfada 24 ürün olduğunu varsayalım
         
         if max_pages == 0:
@@ -158,158 +422,50 @@ def get_products_from_shop(driver, page_limit=1):
             max_pages = page_limit
             logger.info(f"Sayfa limiti nedeniyle sadece {page_limit} sayfa taranacak.")
         
-        # Tüm sayfaları dolaş
-        while current_page <= max_pages:
-            if current_page > 1:
-                # Sonraki sayfa için URL oluştur
-                page_url = TRENDYOL_SHOP_URL
-                if '?' in page_url:
-                    if '&pi=' in page_url:
-                        page_url = re.sub(r'&pi=\d+', f'&pi={current_page}', page_url)
-                    else:
-                        page_url += f'&pi={current_page}'
-                else:
-                    page_url += f'?pi={current_page}'
-                
-                logger.info(f"Sayfa {current_page} açılıyor: {page_url}")
-                driver.get(page_url)
-                time.sleep(5)  # Sayfanın yüklenmesi için bekle
-            
-            # Test sonuçlarına göre doğru seçiciyi kullan
-            product_elements = driver.find_elements(By.CSS_SELECTOR, '.p-card-wrppr')
-            
-            if not product_elements:
-                logger.warning("Hiçbir ürün elementi bulunamadı. Alternatif seçiciler deneniyor...")
-                # Alternatif seçicileri dene
-                selectors = [
-                    '.prdct-desc-cntnr',  # Ürün açıklama konteyneri
-                    '.product-card',   # Arama sonuçları sayfası
-                    '.product-item',   # Alternatif tasarım
-                    '.product-box'     # Başka bir alternatif
-                ]
-                
-                for selector in selectors:
-                    product_elements = driver.find_elements(By.CSS_SELECTOR, selector)
-                    if product_elements:
-                        logger.info(f"Ürün elementleri '{selector}' seçicisi ile bulundu: {len(product_elements)} adet")
-                        break
-            
-            if not product_elements:
-                logger.warning("Hiçbir ürün elementi bulunamadı. Sayfa yapısı değişmiş olabilir.")
-                return []
-            
-            logger.info(f"Toplam {len(product_elements)} ürün bulundu.")
-            
-            products = []
-            for i, element in enumerate(product_elements):
-                try:
-                    # Ürün bilgilerini çıkar
-                    product_name = ""
-                    try:
-                        # Test sonuçlarına göre doğru seçiciyi kullan
-                        product_name_element = element.find_element(By.CSS_SELECTOR, '.prdct-desc-cntnr-name, h3')
-                        product_name = product_name_element.text.strip()
-                    except Exception as e:
-                        logger.warning(f"Ürün {i+1} için isim bulunamadı: {str(e)}")
-                    
-                    # Ürün URL'sini bul
-                    product_url = ""
-                    try:
-                        # Önce doğrudan a etiketini bul
-                        url_elements = element.find_elements(By.CSS_SELECTOR, 'a')
-                        if url_elements:
-                            product_url = url_elements[0].get_attribute('href')
-                        else:
-                            # Eğer a etiketi bulunamazsa, üst elementi kontrol et
-                            parent_element = element.find_element(By.XPATH, '..')
-                            if parent_element.tag_name == 'a':
-                                product_url = parent_element.get_attribute('href')
-                            else:
-                                # Eğer üst element a değilse, içindeki a elementini ara
-                                url_element = parent_element.find_element(By.CSS_SELECTOR, 'a')
-                                product_url = url_element.get_attribute('href')
-                    except Exception as e:
-                        logger.warning(f"Ürün {i+1} için URL bulunamadı: {str(e)}")
-                    
-                    # Ürün ID'sini URL'den çıkar
-                    product_id = None
-                    if product_url:
-                        # URL formatı: https://www.trendyol.com/brand/name-p-123456789
-                        parts = product_url.split('-p-')
-                        if len(parts) > 1:
-                            product_id = parts[1].split('?')[0].strip()
-                            logger.info(f"Ürün ID: {product_id}, URL: {product_url}")
-                        else:
-                            logger.warning(f"Ürün ID bulunamadı, URL: {product_url}")
-                    else:
-                        logger.warning(f"Ürün URL'si bulunamadı: {product_name}")
-                    
-                    # Ürün fiyatını bul
-                    product_price = ""
-                    try:
-                        # Fiyat seçicileri
-                        price_selectors = ['.prc-box-dscntd', '.price', '.product-price', '.discounted-price', '.prc', '.prc-cntnr']
-                        for price_selector in price_selectors:
-                            try:
-                                price_elements = element.find_elements(By.CSS_SELECTOR, price_selector)
-                                if price_elements:
-                                    product_price = price_elements[0].text.strip()
-                                    break
-                            except:
-                                continue
-                    except Exception as e:
-                        logger.warning(f"Ürün {i+1} için fiyat bulunamadı: {str(e)}")
-                    
-                    # Ürün resmini bul
-                    product_image = ""
-                    try:
-                        # Resim seçicileri
-                        img_selectors = ['img.p-card-img', 'img.product-image', 'img', '.image-container img', '.img-container img']
-                        for img_selector in img_selectors:
-                            try:
-                                img_elements = element.find_elements(By.CSS_SELECTOR, img_selector)
-                                if img_elements:
-                                    product_image = img_elements[0].get_attribute('src')
-                                    break
-                            except:
-                                continue
-                        
-                        # Eğer element içinde resim bulunamadıysa, üst elementte ara
-                        if not product_image:
-                            parent_element = element.find_element(By.XPATH, '..')
-                            img_elements = parent_element.find_elements(By.CSS_SELECTOR, 'img')
-                            if img_elements:
-                                product_image = img_elements[0].get_attribute('src')
-                    except Exception as e:
-                        logger.warning(f"Ürün {i+1} için resim bulunamadı: {str(e)}")
-                    
-                    # Ürün bilgilerini listeye ekle
-                    if product_name and product_url:
-                        product = {
-                            "product_id": product_id,
-                            "product_name": product_name,
-                            "my_price": product_price,
-                            "product_url": product_url,
-                            "product_image": product_image
-                        }
-                        products.append(product)
-                        logger.info(f"Ürün {i+1}: {product_name} - {product_price}")
-                    
-                except Exception as e:
-                    logger.error(f"Ürün çıkarılırken hata: {str(e)}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # Ürünleri kaydet
-            all_products.extend(products)
-            logger.info(f"Toplam {len(all_products)} ürün bulundu.")
+        # Sayfalar: ilk sayfa tarayıcıda zaten açık
+        pages = {}
+        products = extract_product_cards(driver, card_extraction)
+        capture_debug('listing_page', 'page-1', lambda: driver.page_source, failed=products is None)
+        if products is None:
+            record_listing_failure(driver)
+            logger.warning("Hiçbir ürün elementi bulunamadı. Sayfa yapısı değişmiş olabilir.")
+            return []
+        RATE_LIMITER.record_success()
+        pages[1] = products
+        
+        remaining_pages = list(range(2, max_pages + 1))
+        
+        # Kalan sayfaları HTTP ile eşzamanlı çek
+        if remaining_pages and listing_workers > 1:
+            pages.update(fetch_listing_pages_concurrently(driver, shop_url, remaining_pages, listing_workers))
+            remaining_pages = [page for page in remaining_pages if page not in pages]
+            if remaining_pages:
+                logger.info(f"{len(remaining_pages)} sayfa tarayıcı ile taranacak: {remaining_pages}")
+        
+        # Kalan sayfaları tarayıcıda sırayla dolaş
+        for current_page in remaining_pages:
+            page_url = build_page_url(shop_url, current_page)
+            logger.info(f"Sayfa {current_page} açılıyor: {page_url}")
+            RATE_LIMITER.acquire()
+            driver.get(page_url)
+            wait_for_page_ready(driver, 'grid')
+            measure_page_traffic(driver)
             
-            current_page += 1
+            products = extract_product_cards(driver, card_extraction)
+            capture_debug('listing_page', f'page-{current_page}', lambda: driver.page_source, failed=products is None)
+            if products is None:
+                record_listing_failure(driver)
+                logger.warning(f"Sayfa {current_page} için ürün elementi bulunamadı.")
+                continue
+            RATE_LIMITER.record_success()
+            pages[current_page] = products
+        
+        all_products = merge_listing_pages(pages)
+        log_run_stats()
         
         # Ürünleri kaydet
-        with open(PRODUCTS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_products, f, ensure_ascii=False, indent=2)
-        logger.info(f"Toplam {len(all_products)} ürün '{PRODUCTS_FILE}' dosyasına kaydedildi.")
+        atomic_write_json(products_file, all_products, ensure_ascii=False, indent=2)
+        logger.info(f"Toplam {len(all_products)} ürün '{products_file}' dosyasına kaydedildi.")
         
         return all_products
     except Exception as e:
@@ -318,40 +474,642 @@ def get_products_from_shop(driver, page_limit=1):
         logger.error(traceback.format_exc())
         return []
 
-def extract_product_json(driver, page_source):
-    """Sayfa kaynağından ürün JSON verisini çıkarır."""
+def record_listing_failure(driver):
+    """Ürün kartı bulunamayan liste sayfasını hız sınırlayıcıya engel olarak bildirir."""
     try:
-        # JavaScript ile doğrudan değişkeni almayı dene
+        reason = challenge_reason(None, driver.page_source) or 'missing_cards'
+    except Exception:
+        reason = 'missing_cards'
+    RATE_LIMITER.record_backoff(reason)
+
+def build_page_url(shop_url, page):
+    """Mağaza URL'sine sayfa numarası (pi) parametresini ekler."""
+    if page <= 1:
+        return shop_url
+    if '?' in shop_url:
+        if '&pi=' in shop_url:
+            return re.sub(r'&pi=\d+', f'&pi={page}', shop_url)
+        return shop_url + f'&pi={page}'
+    return shop_url + f'?pi={page}'
+
+def resolve_shop_url(shop):
+    """Satıcı id'sini mağaza URL'sine çevirir; URL verildiyse aynen döndürür."""
+    shop = shop.strip()
+    if shop.isdigit():
+        return f'https://www.trendyol.com/sr?mid={shop}&os=1'
+    return shop
+
+def parse_shop_list(value):
+    """Virgül veya boşlukla ayrılmış mağaza URL'lerini/satıcı id'lerini URL listesine çevirir."""
+    shop_urls = []
+    for shop in re.split(r'[,\s]+', value or ''):
+        if shop and resolve_shop_url(shop) not in shop_urls:
+            shop_urls.append(resolve_shop_url(shop))
+    return shop_urls
+
+def shop_slug(shop_url):
+    """Mağaza çıktılarının dizin adını üretir (örn. 'mid-1010350')."""
+    match = re.search(r'[?&]mid=(\d+)', shop_url) or re.search(r'-m-(\d+)', shop_url)
+    if match:
+        return f'mid-{match.group(1)}'
+    path = re.sub(r'^https?://[^/]+', '', shop_url)
+    return re.sub(r'[^\w-]+', '-', path).strip('-')[:80] or 'shop'
+
+def shop_products_file(slug):
+    """Mağazanın ürün listesi dosyasının yolunu döndürür."""
+    return os.path.join(SHOPS_OUTPUT_DIR, slug, os.path.basename(PRODUCTS_FILE))
+
+def discover_shops(driver, shop_urls, page_limit=1, card_extraction=CARD_EXTRACTION_MODE, listing_workers=1):
+    """Her mağazanın kataloğunu çeker; {mağaza: ürünler} sözlüğü döndürür."""
+    shop_products = {}
+    for shop_url in shop_urls:
+        slug = shop_slug(shop_url)
+        products_file = shop_products_file(slug)
+        os.makedirs(os.path.dirname(products_file), exist_ok=True)
+        shop_products[slug] = get_products_from_shop(driver, shop_url, page_limit=page_limit, card_extraction=card_extraction,
+                                                     listing_workers=listing_workers, products_file=products_file)
+        logger.info(f"Mağaza {slug}: {len(shop_products[slug])} ürün bulundu.")
+    return shop_products
+
+def load_shop_products(shop_urls):
+    """Daha önce çekilmiş mağaza ürün listelerini okur (--only-process için)."""
+    shop_products = {}
+    for shop_url in shop_urls:
+        slug = shop_slug(shop_url)
         try:
-            product_data = driver.execute_script("return window.__PRODUCT_DETAIL_APP_INITIAL_STATE__")
-            if product_data:
+            with open(shop_products_file(slug), 'r', encoding='utf-8') as f:
+                shop_products[slug] = json.load(f)
+        except Exception as e:
+            logger.error(f"Mağaza {slug} ürün dosyası yüklenirken hata: {str(e)}")
+    return shop_products
+
+def dedupe_shop_products(shop_products):
+    """Mağazalarda ortak olan ürünleri tekilleştirir; her ürün bir kez taranır.
+    
+    Ürünün ilk görüldüğü mağazanın kart bilgileri kullanılır, 'shops'
+    alanında ürünün bulunduğu tüm mağazalar tutulur.
+    """
+    unique = {}
+    total = 0
+    for slug, products in shop_products.items():
+        for product in products:
+            total += 1
+            key = str(resolve_product_id(product) or product.get('product_url'))
+            if key in unique:
+                unique[key]['shops'].append(slug)
+            else:
+                unique[key] = dict(product, shops=[slug])
+    logger.info(f"{len(shop_products)} mağazada {total} ürün, ortak ürünler çıkarıldıktan sonra {len(unique)} ürün taranacak.")
+    return list(unique.values())
+
+def write_shop_outputs(shop_products, results):
+    """Ortak tarama sonuçlarını mağaza bazlı rakip fiyatı dosyalarına dağıtır.
+    
+    Kendi fiyat alanları her mağazanın kendi ürün kartından alınır. Sonuçlar
+    tek geçişte akış halinde okunur ve her mağazanın dosyasına ortak tarama
+    sırasıyla eklenir; bellekte yalnızca mağazaların ürün kartları tutulur.
+    """
+    cards_by_id = {}
+    for slug, products in shop_products.items():
+        for product in products:
+            cards_by_id.setdefault(str(resolve_product_id(product)), []).append((slug, product))
+    
+    writers = {}
+    try:
+        for slug in shop_products:
+            writers[slug] = JsonListWriter(os.path.join(SHOPS_OUTPUT_DIR, slug, os.path.basename(COMPETITOR_DATA_FILE)))
+        for result in results:
+            for slug, product in cards_by_id.get(str(result.get('product_id')), ()):
+                shop_result = dict(result, shop=slug)
+                if product.get('my_price'):
+                    my_price_value, currency = parse_price(product['my_price'])
+                    shop_result.update(my_price=product['my_price'], my_price_value=my_price_value, currency=currency)
+                writers[slug].write(shop_result)
+        for slug, writer in writers.items():
+            writer.close()
+            logger.info(f"Mağaza {slug}: {writer.count} ürünün sonucu '{writer.path}' dosyasına kaydedildi.")
+    finally:
+        for writer in writers.values():
+            writer.discard()
+
+def merge_listing_pages(pages):
+    """Sayfa sonuçlarını sayfa sırasıyla birleştirir, tekrarlanan ürünleri atar."""
+    all_products = []
+    seen = set()
+    duplicates = 0
+    for page in sorted(pages):
+        for product in pages[page]:
+            key = product.get('product_id') or product.get('product_url')
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            all_products.append(product)
+    if duplicates:
+        logger.info(f"{duplicates} tekrarlanan ürün listeden çıkarıldı.")
+    return all_products
+
+def fetch_listing_page_http(session, page_url):
+    """Bir liste sayfasını HTTP ile indirip ürün kartlarını çıkarır; başarısızsa None döner."""
+    RATE_LIMITER.acquire()
+    try:
+        response = session.get(page_url, timeout=HTTP_TIMEOUT_SECONDS)
+    except requests.RequestException as e:
+        RATE_LIMITER.record_backoff('network_error')
+        logger.warning(f"Liste sayfası indirilemedi: {page_url} - {str(e)}")
+        return None
+    
+    reason = challenge_reason(response.status_code, None)
+    if reason:
+        RATE_LIMITER.record_backoff(reason)
+    if reason or response.status_code != 200:
+        logger.warning(f"Liste sayfası alınamadı (HTTP {response.status_code}): {page_url}")
+        return None
+    
+    products = parse_product_cards(response.text, page_url)
+    if not products:
+        # Engel işaretlerine sadece kart bulunamadığında bakılır
+        reason = challenge_reason(None, response.text)
+        if reason:
+            RATE_LIMITER.record_backoff(reason)
+            logger.warning(f"Liste sayfasında engel algılandı: {page_url}")
+            return None
+    RATE_LIMITER.record_success()
+    return products
+
+def fetch_listing_pages_concurrently(driver, shop_url, page_numbers, listing_workers):
+    """Verilen liste sayfalarını eşzamanlı HTTP istekleriyle çeker.
+    
+    Oturum, tarayıcının çerezlerini (Cloudflare izni dahil) taşır. Başarılı
+    sayfalar {sayfa_no: ürünler} olarak döner.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    session = create_http_session(pool_size=listing_workers)
+    try:
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+    except Exception as e:
+        logger.warning(f"Tarayıcı çerezleri HTTP oturumuna aktarılamadı: {str(e)}")
+    
+    start_time = time.time()
+    pages = {}
+    try:
+        with ThreadPoolExecutor(max_workers=listing_workers) as executor:
+            futures = {
+                page: executor.submit(fetch_listing_page_http, session, build_page_url(shop_url, page))
+                for page in page_numbers
+            }
+            for page, future in futures.items():
+                products = future.result()
+                if products is not None:
+                    pages[page] = products
+    finally:
+        session.close()
+    
+    logger.info(f"{len(pages)}/{len(page_numbers)} liste sayfası {time.time() - start_time:.1f} saniyede HTTP ile çekildi.")
+    return pages
+
+# Ürün kartı seçicileri (test_selectors.py sonuçlarına göre)
+CARD_SELECTORS = [
+    '.p-card-wrppr',       # Standart mağaza sayfası
+    '.prdct-desc-cntnr',   # Ürün açıklama konteyneri
+    '.product-card',       # Arama sonuçları sayfası
+    '.product-item',       # Alternatif tasarım
+    '.product-box'         # Başka bir alternatif
+]
+CARD_NAME_SELECTOR = '.prdct-desc-cntnr-name, h3'
+CARD_PRICE_SELECTORS = ['.prc-box-dscntd', '.price', '.product-price', '.discounted-price', '.prc', '.prc-cntnr']
+CARD_IMAGE_SELECTORS = ['img.p-card-img', 'img.product-image', 'img', '.image-container img', '.img-container img']
+
+# Tüm kart alanlarını tek bir execute_script çağrısıyla okur
+EXTRACT_CARDS_SCRIPT = """
+const [cardSelectors, nameSelector, priceSelectors, imageSelectors] = arguments;
+const first = (root, selectors) => {
+    for (const selector of selectors) {
+        const found = root.querySelector(selector);
+        if (found) return found;
+    }
+    return null;
+};
+for (const cardSelector of cardSelectors) {
+    const elements = document.querySelectorAll(cardSelector);
+    if (!elements.length) continue;
+    const cards = [];
+    for (const element of elements) {
+        const parent = element.parentElement;
+        const nameElement = element.querySelector(nameSelector);
+        let link = element.querySelector('a');
+        if (!link && parent) {
+            link = parent.tagName === 'A' ? parent : parent.querySelector('a');
+        }
+        const priceElement = first(element, priceSelectors);
+        let image = first(element, imageSelectors);
+        if (!image && parent) image = parent.querySelector('img');
+        cards.push({
+            name: nameElement ? nameElement.innerText.trim() : '',
+            url: link ? link.href : '',
+            price: priceElement ? priceElement.innerText.trim() : '',
+            image: image ? image.src : ''
+        });
+    }
+    return {selector: cardSelector, cards: cards};
+}
+return {selector: null, cards: []};
+"""
+
+def _build_card_product(i, product_name, product_url, product_price, product_image):
+    """Karttan okunan alanlardan ürün sözlüğünü oluşturur."""
+    # Ürün ID'sini URL'den çıkar
+    product_id = None
+    if product_url:
+        # URL formatı: https://www.trendyol.com/brand/name-p-123456789
+        parts = product_url.split('-p-')
+        if len(parts) > 1:
+            product_id = parts[1].split('?')[0].strip()
+            logger.info(f"Ürün ID: {product_id}, URL: {product_url}")
+        else:
+            logger.warning(f"Ürün ID bulunamadı, URL: {product_url}")
+    else:
+        logger.warning(f"Ürün URL'si bulunamadı: {product_name}")
+    
+    if not (product_name and product_url):
+        return None
+    
+    logger.info(f"Ürün {i+1}: {product_name} - {product_price}")
+    return {
+        "product_id": product_id,
+        "product_name": product_name,
+        "my_price": product_price,
+        "product_url": product_url,
+        "product_image": product_image
+    }
+
+def extract_cards_with_script(driver):
+    """Sayfadaki tüm ürün kartlarını tek bir WebDriver çağrısıyla okur.
+    
+    Kart bulunamazsa None döner.
+    """
+    result = driver.execute_script(
+        EXTRACT_CARDS_SCRIPT, CARD_SELECTORS, CARD_NAME_SELECTOR, CARD_PRICE_SELECTORS, CARD_IMAGE_SELECTORS
+    )
+    if not result or not result.get('cards'):
+        return None
+    
+    logger.info(f"Ürün elementleri '{result['selector']}' seçicisi ile bulundu: {len(result['cards'])} adet")
+    products = []
+    for i, card in enumerate(result['cards']):
+        product = _build_card_product(i, card.get('name', ''), card.get('url', ''), card.get('price', ''), card.get('image', ''))
+        if product:
+            products.append(product)
+    return products
+
+def parse_product_cards(page_source, base_url='https://www.trendyol.com'):
+    """Liste sayfası HTML'inden ürün kartlarını BeautifulSoup ile çıkarır.
+    
+    Kart bulunamazsa None döner.
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(page_source, 'html.parser')
+    product_elements = []
+    for selector in CARD_SELECTORS:
+        product_elements = soup.select(selector)
+        if product_elements:
+            logger.info(f"Ürün elementleri '{selector}' seçicisi ile bulundu: {len(product_elements)} adet")
+            break
+    
+    if not product_elements:
+        return None
+    
+    def first(root, selectors):
+        for selector in selectors:
+            found = root.select_one(selector)
+            if found:
+                return found
+        return None
+    
+    products = []
+    for i, element in enumerate(product_elements):
+        parent = element.parent
+        name_element = element.select_one(CARD_NAME_SELECTOR)
+        link = element.find('a', href=True)
+        if link is None and parent is not None:
+            link = parent if parent.name == 'a' else parent.find('a', href=True)
+        price_element = first(element, CARD_PRICE_SELECTORS)
+        image = first(element, CARD_IMAGE_SELECTORS)
+        if image is None and parent is not None:
+            image = parent.find('img')
+        
+        product = _build_card_product(
+            i,
+            name_element.get_text(' ', strip=True) if name_element else '',
+            urljoin(base_url, link.get('href', '')) if link is not None else '',
+            price_element.get_text(' ', strip=True) if price_element else '',
+            urljoin(base_url, image.get('src', '')) if image is not None and image.get('src') else ''
+        )
+        if product:
+            products.append(product)
+    return products
+
+def extract_product_cards(driver, card_extraction=CARD_EXTRACTION_MODE):
+    """Açık liste sayfasındaki ürün kartlarını seçili yöntemle çıkarır.
+    
+    'script' tüm kartları tek execute_script çağrısıyla, 'soup' tek bir
+    page_source anlık görüntüsünden, 'element' ise kart başına WebElement
+    çağrılarıyla okur. Kart bulunamazsa None döner.
+    """
+    start_time = time.time()
+    products = None
+    if card_extraction == 'script':
+        try:
+            products = extract_cards_with_script(driver)
+        except Exception as e:
+            logger.warning(f"Kartlar JavaScript ile okunamadı, WebElement yöntemine geçiliyor: {str(e)}")
+            card_extraction = 'element'
+    elif card_extraction == 'soup':
+        products = parse_product_cards(driver.page_source, driver.current_url)
+    
+    if card_extraction == 'element':
+        product_elements = []
+        for selector in CARD_SELECTORS:
+            product_elements = driver.find_elements(By.CSS_SELECTOR, selector)
+            if product_elements:
+                logger.info(f"Ürün elementleri '{selector}' seçicisi ile bulundu: {len(product_elements)} adet")
+                break
+        if product_elements:
+            products = _extract_cards_with_elements(product_elements)
+    
+    if products is not None:
+        logger.info(f"Toplam {len(products)} ürün kartı {(time.time() - start_time) * 1000:.0f} ms içinde okundu ({card_extraction}).")
+    return products
+
+def _extract_cards_with_elements(product_elements):
+    """Ürün kartlarını WebElement'ler üzerinden tek tek okur (eski yöntem)."""
+    products = []
+    for i, element in enumerate(product_elements):
+        try:
+            # Ürün bilgilerini çıkar
+            product_name = ""
+            try:
+                # Test sonuçlarına göre doğru seçiciyi kullan
+                product_name_element = element.find_element(By.CSS_SELECTOR, CARD_NAME_SELECTOR)
+                product_name = product_name_element.text.strip()
+            except Exception as e:
+                logger.warning(f"Ürün {i+1} için isim bulunamadı: {str(e)}")
+            
+            # Ürün URL'sini bul
+            product_url = ""
+            try:
+                # Önce doğrudan a etiketini bul
+                url_elements = element.find_elements(By.CSS_SELECTOR, 'a')
+                if url_elements:
+                    product_url = url_elements[0].get_attribute('href')
+                else:
+                    # Eğer a etiketi bulunamazsa, üst elementi kontrol et
+                    parent_element = element.find_element(By.XPATH, '..')
+                    if parent_element.tag_name == 'a':
+                        product_url = parent_element.get_attribute('href')
+                    else:
+                        # Eğer üst element a değilse, içindeki a elementini ara
+                        url_element = parent_element.find_element(By.CSS_SELECTOR, 'a')
+                        product_url = url_element.get_attribute('href')
+            except Exception as e:
+                logger.warning(f"Ürün {i+1} için URL bulunamadı: {str(e)}")
+            
+            # Ürün fiyatını bul
+            product_price = ""
+            try:
+                # Fiyat seçicileri
+                price_selectors = CARD_PRICE_SELECTORS
+                for price_selector in price_selectors:
+                    try:
+                        price_elements = element.find_elements(By.CSS_SELECTOR, price_selector)
+                        if price_elements:
+                            product_price = price_elements[0].text.strip()
+                            break
+                    except:
+                        continue
+            except Exception as e:
+                logger.warning(f"Ürün {i+1} için fiyat bulunamadı: {str(e)}")
+            
+            # Ürün resmini bul
+            product_image = ""
+            try:
+                # Resim seçicileri
+                img_selectors = CARD_IMAGE_SELECTORS
+                for img_selector in img_selectors:
+                    try:
+                        img_elements = element.find_elements(By.CSS_SELECTOR, img_selector)
+                        if img_elements:
+                            product_image = img_elements[0].get_attribute('src')
+                            break
+                    except:
+                        continue
+                
+                # Eğer element içinde resim bulunamadıysa, üst elementte ara
+                if not product_image:
+                    parent_element = element.find_element(By.XPATH, '..')
+                    img_elements = parent_element.find_elements(By.CSS_SELECTOR, 'img')
+                    if img_elements:
+                        product_image = img_elements[0].get_attribute('src')
+            except Exception as e:
+                logger.warning(f"Ürün {i+1} için resim bulunamadı: {str(e)}")
+            
+            # Ürün bilgilerini listeye ekle
+            product = _build_card_product(i, product_name, product_url, product_price, product_image)
+            if product:
+                products.append(product)
+            
+        except Exception as e:
+            logger.error(f"Ürün çıkarılırken hata: {str(e)}")
+            import traceback
+            logger.error(traceback.format_exc())
+    
+    return products
+
+FULL_STATE_SCRIPT = "return window.__PRODUCT_DETAIL_APP_INITIAL_STATE__"
+
+# Sadece kullanılan alt ağaçları döndürür; WebDriver üzerinden taşınan veri küçülür
+SUBTREE_STATE_SCRIPT = """
+const state = window.__PRODUCT_DETAIL_APP_INITIAL_STATE__;
+if (!state) return null;
+const product = state.product || {};
+const result = {product: {}};
+if (product.price !== undefined) result.product.price = product.price;
+if (product.otherMerchants !== undefined) result.product.otherMerchants = product.otherMerchants;
+if (state.otherMerchants !== undefined) result.otherMerchants = state.otherMerchants;
+return result;
+"""
+
+# Sayfa anlık görüntüsü istatistikleri (WebDriver/HTTP üzerinden taşınan veri)
+SNAPSHOT_STATS = {
+    'pages': 0, 'html_fetches': 0, 'state_fetches': 0, 'html_bytes': 0, 'state_bytes': 0,
+    'fetch_seconds': 0.0, 'parse_seconds': 0.0,
+}
+_snapshot_stats_lock = threading.Lock()
+
+class PageSnapshot:
+    """Bir sayfa ziyaretinin HTML ve state verisini bir kez alıp tüm aşamalarla paylaşır.
+    
+    Tarayıcıda state önce tek bir execute_script çağrısıyla alınır; sayfa
+    kaynağı yalnızca state alınamazsa veya hata ayıklama kaydı istenirse
+    çekilir. HTTP ile alınan sayfalarda HTML hazırdır ve state ondan çözülür.
+    Her değer ilk erişimde alınır ve önbelleğe alınır.
+    """
+    
+    def __init__(self, url, driver=None, html=None, source='browser'):
+        self.url = url
+        self.source = source
+        self.timings = {}
+        self.sizes = {}
+        self._driver = driver
+        self._html = html
+        self._state = None
+        self._state_loaded = False
+        self._state_bytes = None
+        if html is not None:
+            self.sizes['html'] = len(html)
+        self._count('pages', 1)
+    
+    @staticmethod
+    def _count(key, value):
+        with _snapshot_stats_lock:
+            SNAPSHOT_STATS[key] += value
+    
+    @property
+    def html(self):
+        """Sayfa kaynağı; tarayıcıdan en fazla bir kez alınır."""
+        if self._html is None and self._driver is not None:
+            start_time = time.perf_counter()
+            try:
+                self._html = self._driver.page_source
+            except Exception as e:
+                logger.error(f"Sayfa kaynağı alınamadı: {str(e)}")
+                self._html = ''
+            elapsed = time.perf_counter() - start_time
+            self.timings['html'] = elapsed
+            self.sizes['html'] = len(self._html)
+            self._count('html_fetches', 1)
+            self._count('html_bytes', len(self._html))
+            self._count('fetch_seconds', elapsed)
+        return self._html
+    
+    @property
+    def state(self):
+        """Ürün state verisi; alınamazsa None."""
+        if not self._state_loaded:
+            self._state_loaded = True
+            if self._driver is not None:
+                self._state = self._fetch_state_script()
+            if not self._state and self.html:
+                start_time = time.perf_counter()
+                self._state = extract_state_from_html(self.html)
+                elapsed = time.perf_counter() - start_time
+                self.timings['parse'] = elapsed
+                self._count('parse_seconds', elapsed)
+        return self._state
+    
+    def _fetch_state_script(self):
+        """State verisini JavaScript ile doğrudan tarayıcıdan alır."""
+        start_time = time.perf_counter()
+        try:
+            state = self._driver.execute_script(SUBTREE_STATE_SCRIPT if STATE_SUBTREES_ONLY else FULL_STATE_SCRIPT)
+            if state:
                 logger.info("JavaScript ile ürün verisi alındı.")
-                return product_data
+            return state
         except Exception as e:
             logger.error(f"JavaScript ile ürün verisi alınamadı: {str(e)}")
+            return None
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.timings['state'] = elapsed
+            self._count('state_fetches', 1)
+            self._count('fetch_seconds', elapsed)
+    
+    @property
+    def state_bytes(self):
+        """State verisinin kanonik JSON baytları (arşiv ve boyut ölçümü için bir kez üretilir)."""
+        if self._state_bytes is None and self.state:
+            self._state_bytes = canonical_bytes(self.state)
+            self.sizes['state'] = len(self._state_bytes)
+            self._count('state_bytes', len(self._state_bytes))
+        return self._state_bytes
+    
+    def release(self):
+        """Tarayıcı referansını bırakır; önbelleğe alınmamış değerler artık çekilmez."""
+        self._driver = None
+
+def log_snapshot_stats():
+    """Sayfa anlık görüntüsü istatistiklerini loglar."""
+    with _snapshot_stats_lock:
+        stats = dict(SNAPSHOT_STATS)
+    pages = stats['pages']
+    if not pages:
+        return
+    logger.info(
+        f"Sayfa verisi: {pages} sayfa, {stats['state_fetches']} state çağrısı, {stats['html_fetches']} sayfa kaynağı "
+        f"çekimi ({stats['html_bytes'] / 1024:.0f} KB), ürün başına ortalama {stats['state_bytes'] / pages / 1024:.0f} KB state, "
+        f"çekme {stats['fetch_seconds'] / pages * 1000:.0f} ms, çözme {stats['parse_seconds'] / pages * 1000:.0f} ms"
+    )
+
+def extract_state_from_html(page_source):
+    """Ham HTML içindeki window.__PRODUCT_DETAIL_APP_INITIAL_STATE__ nesnesini çıkarır."""
+    try:
+        product_data = extract_state(page_source, USED_STATE_SUBTREES if STATE_SUBTREES_ONLY else None)
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON parse hatası: {str(e)}")
+        # Hatalı JSON'ı kaydet
+        capture_debug('state_error', 'product_state', lambda: state_source_snippet(page_source), failed=True, extension='txt')
+        return None
+    
+    if product_data is None:
+        logger.warning("Sayfada JSON verisi bulunamadı.")
+    else:
+        logger.info("Sayfa kaynağından ürün verisi alındı.")
+    return product_data
+
+def fetch_product_snapshot_http(session, product_url):
+    """Ürün sayfasını tarayıcısız indirir ve state verisi çözülmüş PageSnapshot döndürür.
+    
+    Engel sayfası, HTTP hatası veya çözümlenemeyen state durumunda None döner.
+    """
+    try:
+        RATE_LIMITER.acquire()
+        start_time = time.time()
+        response = session.get(product_url, timeout=HTTP_TIMEOUT_SECONDS)
+        elapsed_ms = (time.time() - start_time) * 1000
         
-        # Regex ile JSON verisini çıkar
-        pattern = r'window\.__PRODUCT_DETAIL_APP_INITIAL_STATE__\s*=\s*({.*?});'
-        matches = re.search(pattern, page_source, re.DOTALL)
+        reason = challenge_reason(response.status_code, None)
+        if reason:
+            RATE_LIMITER.record_backoff(reason)
+            logger.warning(f"Engel sayfası algılandı (HTTP {response.status_code}): {product_url}")
+            capture_debug('challenge_page', product_url.rsplit('/', 1)[-1], response.text, failed=True)
+            return None
         
-        if matches:
-            json_str = matches.group(1)
-            try:
-                product_data = json.loads(json_str)
-                logger.info("Regex ile ürün verisi alındı.")
-                return product_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON parse hatası: {str(e)}")
-                # Hatalı JSON'ı kaydet
-                with open(f'error_product_json.txt', 'w', encoding='utf-8') as f:
-                    f.write(json_str)
-                logger.info("Hatalı JSON 'error_product_json.txt' dosyasına kaydedildi.")
-        else:
-            logger.warning("Sayfada JSON verisi bulunamadı.")
+        if response.status_code != 200:
+            logger.warning(f"HTTP {response.status_code} yanıtı alındı: {product_url}")
+            return None
         
-        return None
-    except Exception as e:
-        logger.error(f"Ürün JSON verisi çıkarılırken hata: {str(e)}")
+        snapshot = PageSnapshot(product_url, html=response.text, source='http')
+        snapshot.timings['fetch'] = elapsed_ms / 1000
+        if not snapshot.state:
+            # Engel işaretlerine sadece state çözülemediğinde bakılır
+            reason = challenge_reason(None, response.text)
+            if reason:
+                logger.warning(f"Engel sayfası algılandı (HTTP {response.status_code}): {product_url}")
+                capture_debug('challenge_page', product_url.rsplit('/', 1)[-1], response.text, failed=True)
+            else:
+                capture_debug('product_page_http', product_url.rsplit('/', 1)[-1], response.text, failed=True)
+            RATE_LIMITER.record_backoff(reason or 'missing_state')
+            return None
+        capture_debug('product_page_http', product_url.rsplit('/', 1)[-1], response.text, failed=False)
+        RATE_LIMITER.record_success()
+        logger.info(f"Ürün verisi HTTP ile alındı ({elapsed_ms:.0f} ms).")
+        return snapshot
+    except requests.RequestException as e:
+        RATE_LIMITER.record_backoff('network_error')
+        logger.warning(f"HTTP isteği başarısız: {product_url} - {str(e)}")
         return None
 
 def process_product(driver, product, index, total):
@@ -365,50 +1123,29 @@ def process_product(driver, product, index, total):
         logger.error(f"Ürün URL'si bulunamadı: {product_name}")
         return None
     
+    product_id = product.get('product_id')
     try:
-        # Ürün sayfasını aç
+        # Ürün sayfasını aç (hız sınırlayıcı izin verene kadar beklenir)
+        RATE_LIMITER.acquire()
         driver.get(product_url)
-        time.sleep(5)  # Sayfanın yüklenmesi için bekle
+        wait_for_page_ready(driver, 'product_state')
+        measure_page_traffic(driver)
         
         # Ürün ID'sini URL'den çıkar (eğer daha önce çıkarılmadıysa)
-        product_id = product.get('product_id')
-        if not product_id:
-            # URL formatı: https://www.trendyol.com/brand/name-p-123456789
-            parts = product_url.split('-p-')
-            if len(parts) > 1:
-                product_id = parts[1].split('?')[0].strip()
-                product['product_id'] = product_id
-                logger.info(f"Ürün ID URL'den çıkarıldı: {product_id}")
-            else:
-                logger.warning(f"Ürün ID URL'den çıkarılamadı: {product_url}")
-        
-        # Hata ayıklama için sayfa kaynağını kaydet
-        with open('product_page_source.html', 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
-        
-        # Ürün JSON verisini çıkar
-        product_json = extract_product_json(driver, driver.page_source)
-        if product_json:
-            # JSON verisini kaydet
-            product_json_file = f'{PRODUCT_DATA_DIR}/product_json_{product_id}.json'
-            with open(product_json_file, 'w', encoding='utf-8') as f:
-                json.dump(product_json, f, ensure_ascii=False, indent=2)
-            logger.info(f"Ürün JSON verisi '{product_json_file}' dosyasına kaydedildi.")
-            
-            # Rakip fiyatlarını çıkar
-            competitor_prices = extract_competitor_prices(product_json, product)
-            return competitor_prices  # Artık extract_competitor_prices her zaman bir sonuç döndürüyor
+        product_id = resolve_product_id(product)
+        
+        # Sayfa verisi bir kez alınır ve tüm aşamalarda paylaşılır
+        snapshot = PageSnapshot(product_url, driver=driver)
+        
+        # Hata ayıklama için sayfa kaynağını kaydet (DEBUG_CAPTURE_MODE'a göre)
+        capture_debug('product_page', product_id, lambda: snapshot.html, failed=not snapshot.state)
+        if snapshot.state:
+            RATE_LIMITER.record_success()
         else:
-            logger.warning(f"Ürün {product_id} için JSON verisi çıkarılamadı.")
-            # JSON verisi çıkarılamadıysa bile ürünü ekleyelim
-            return {
-                'product_id': product_id,
-                'product_name': product_name,
-                'product_image': product.get('product_image', ''),
-                'product_url': product_url,
-                'my_price': product.get('my_price', ''),
-                'competitors': []
-            }
+            # Sayfa kaynağı sadece başarısız sayfalarda okunur
+            RATE_LIMITER.record_backoff(challenge_reason(None, snapshot.html) or 'missing_state')
+        snapshot.release()
+        return build_product_result(snapshot, product)
         
     except Exception as e:
         logger.error(f"Ürün {product_id} işlenirken hata: {str(e)}")
@@ -416,6 +1153,93 @@ def process_product(driver, product, index, total):
         logger.error(traceback.format_exc())
         return None
 
+def build_product_result(snapshot, product):
+    """Sayfa anlık görüntüsündeki state verisini arşivler ve rakip fiyatları sonucunu oluşturur."""
+    product_id = product.get('product_id')
+    product_json = snapshot.state if snapshot is not None else None
+    if product_json:
+        record_fetch(product_id)
+        
+        # Ham JSON verisini arşive kaydet (değişmeyen içerik yeniden yazılmaz)
+        if RAW_ARCHIVE is not None:
+            try:
+                digest = RAW_ARCHIVE.store(product_id, product_json, snapshot.state_bytes)
+                logger.debug(f"Ürün {product_id} ham verisi arşivlendi: {digest[:12]}")
+            except Exception as e:
+                logger.error(f"Ham veri arşivlenirken hata: {str(e)}")
+        
+        # Rakip fiyatlarını çıkar
+        competitor_prices = extract_competitor_prices(product_json, product)
+        return competitor_prices  # Artık extract_competitor_prices her zaman bir sonuç döndürüyor
+    
+    logger.warning(f"Ürün {product_id} için JSON verisi çıkarılamadı.")
+    # JSON verisi çıkarılamadıysa bile ürünü ekleyelim
+    my_price_value, currency = parse_price(product.get('my_price', ''))
+    return {
+        'product_id': product_id,
+        'product_name': product.get('product_name', 'Bilinmeyen Ürün'),
+        'product_image': product.get('product_image', ''),
+        'product_url': product.get('product_url', ''),
+        'my_price': product.get('my_price', ''),
+        'my_price_value': my_price_value,
+        'currency': currency,
+        'competitors': []
+    }
+
+class ProductFetcher:
+    """Bir worker'ın ürün sayfalarını çekmek için kullandığı kaynakları yönetir.
+    
+    'http' modunda sayfa önce havuzlu requests.Session ile indirilir; engel
+    sayfası gelirse veya state çözümlenemezse ürün Selenium ile yeniden işlenir.
+    Tarayıcı yalnızca ilk ihtiyaç anında, lean ile verilen profille başlatılır.
+    """
+    
+    def __init__(self, fetch_mode=FETCH_MODE, name="fetcher", lean=LEAN_PROFILE):
+        self.fetch_mode = fetch_mode
+        self.name = name
+        self.lean = lean
+        self.session = create_http_session() if fetch_mode == 'http' else None
+        self._driver = None
+        self.http_hits = 0
+        self.browser_fallbacks = 0
+    
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = setup_driver(lean=self.lean)
+            add_cookies(self._driver)
+            logger.info(f"{self.name}: Chrome başlatıldı.")
+        return self._driver
+    
+    def process(self, product, index, total):
+        """Ürünü seçili moda göre işler ve rakip fiyatları sonucunu döndürür."""
+        if self.fetch_mode == 'http':
+            product_url = product.get('product_url', '')
+            if product_url:
+                logger.info(f"İşleniyor (HTTP): {index}/{total} - {product.get('product_name', 'Bilinmeyen Ürün')}")
+                resolve_product_id(product)
+                snapshot = fetch_product_snapshot_http(self.session, product_url)
+                if snapshot:
+                    self.http_hits += 1
+                    return build_product_result(snapshot, product)
+                logger.info(f"Ürün {product.get('product_id')} için Selenium'a geçiliyor.")
+                self.browser_fallbacks += 1
+        
+        return process_product(self.driver, product, index, total)
+    
+    def close(self):
+        """Tarayıcıyı ve HTTP oturumunu kapatır."""
+        if self.fetch_mode == 'http':
+            logger.info(f"{self.name}: {self.http_hits} ürün HTTP ile, {self.browser_fallbacks} ürün Selenium ile işlendi.")
+        if self.session is not None:
+            self.session.close()
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logger.error(f"{self.name}: Tarayıcı kapatılırken hata: {str(e)}")
+            self._driver = None
+
 def extract_competitor_prices(product_json, product):
     """Ürün JSON verisinden rakip fiyatlarını çıkarır."""
     try:
@@ -436,6 +1260,7 @@ def extract_competitor_prices(product_json, product):
             discounted_price = price_info.get('discountedPrice', {})
             my_price = discounted_price.get('text', '')
             logger.info(f"Ürün {product_id} için fiyat JSON'dan alındı: {my_price}")
+        my_price_value, currency = parse_price(my_price)
         
         # Rakip fiyatlarını çıkar - product_json içindeki otherMerchants alanından
         # Önce product_detail_context'i kontrol et (JSON yapısı değişebilir)
@@ -454,6 +1279,8 @@ def extract_competitor_prices(product_json, product):
                 'product_image': product_image,
                 'product_url': product_url,
                 'my_price': my_price,
+                'my_price_value': my_price_value,
+                'currency': currency,
                 'competitors': []
             }
             return result
@@ -464,16 +1291,19 @@ def extract_competitor_prices(product_json, product):
             merchant_name = merchant_info.get('name', 'Bilinmeyen Satıcı')
             merchant_price = merchant.get('price', {}).get('discountedPrice', {}).get('text', '')
             merchant_rating = merchant_info.get('sellerScore', 0)
+            price_value, price_currency = parse_price(merchant_price)
             
             competitor = {
                 'name': merchant_name,
                 'price': merchant_price,
+                'price_value': price_value,
+                'currency': price_currency,
                 'rating': merchant_rating
             }
             competitors.append(competitor)
         
         # Rakip fiyatlarını sırala
-        competitors = sorted(competitors, key=lambda x: float(x['price'].replace('TL', '').replace('.', '').replace(',', '.').strip()) if x['price'] else float('inf'))
+        competitors = sorted(competitors, key=lambda x: x['price_value'] if x['price_value'] is not None else float('inf'))
         
         # Sonuç objesini oluştur
         result = {
@@ -482,6 +1312,8 @@ def extract_competitor_prices(product_json, product):
             'product_image': product_image,
             'product_url': product_url,
             'my_price': my_price,
+            'my_price_value': my_price_value,
+            'currency': currency,
             'competitors': competitors,
             'last_update': datetime.now().strftime("%d.%m.%Y %H:%M:%S")
         }
@@ -492,142 +1324,566 @@ def extract_competitor_prices(product_json, product):
         logger.error(f"Ürün {product_id} için rakip fiyatları çıkarılırken hata: {str(e)}")
         return None
 
+def parse_arguments():
+    """Komut satırı argümanlarını işler."""
+    parser = argparse.ArgumentParser(description='Trendyol Ürün ve Rakip Fiyat Takip Aracı')
+    parser.add_argument('--only-fetch', action='store_true', help='Sadece ürünleri çek, işleme')
+    parser.add_argument('--only-process', action='store_true', help='Sadece mevcut ürünleri işle, yeni çekme')
+    parser.add_argument('--shop-url', type=str, help='Mağaza URL\'si (varsayılan: .env dosyasındaki)')
+    parser.add_argument('--shops', type=str, default=TRENDYOL_SHOP_URLS,
+                        help='Çoklu mağaza modu: virgülle ayrılmış mağaza URL\'leri veya satıcı id\'leri; '
+                             'ortak ürünler bir kez taranır, çıktılar mağaza bazında ayrılır')
+    parser.add_argument('--limit', type=int, help='İşlenecek maksimum ürün sayısı')
+    parser.add_argument('--page-limit', type=int, default=5, help='Taranacak maksimum sayfa sayısı')
+    parser.add_argument('--listing-workers', type=int, default=1,
+                        help='Liste sayfalarını eşzamanlı çekecek HTTP worker sayısı (1: tarayıcıda sırayla)')
+    parser.add_argument('--card-extraction', choices=['script', 'soup', 'element'], default=CARD_EXTRACTION_MODE,
+                        help='Liste sayfasındaki ürün kartlarını okuma yöntemi')
+    parser.add_argument('--lean', action='store_true', default=LEAN_PROFILE,
+                        help='Resim, font, medya ve takip betiklerini engelleyen hafif tarayıcı profilini kullan')
+    parser.add_argument('--debug-capture', choices=DEBUG_CAPTURE_MODES, default=DEBUG_CAPTURE.mode,
+                        help='Hata ayıklama için sayfa kaynağı kaydı: off, failure, sample (1/N) veya ring (son K)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Sadece yeni veya TTL süresini aşmış ürünleri tara, diğerlerinin önceki sonuçlarını koru')
+    parser.add_argument('--ttl-hours', type=float, default=FRESHNESS_TTL_HOURS,
+                        help='Artımlı modda bir ürünün güncel sayılacağı süre (saat)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Yarıda kalan çalışmaya devam et; günlükte sonucu olan ürünleri atla')
+    parser.add_argument('--workers', type=int, default=1, help='Paralel çalışacak tarayıcı (worker) sayısı')
+    parser.add_argument('--fetch-mode', choices=['browser', 'http', 'async'], default=FETCH_MODE,
+                        help='Ürün sayfalarını çekme yöntemi: browser (Selenium), http (tarayıcısız) veya async (asyncio ile eşzamanlı HTTP)')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('ASYNC_CONCURRENCY', 50)),
+                        help='async modunda aynı anda uçuşta tutulacak istek sayısı')
+    parser.add_argument('--per-host-limit', type=int, default=int(os.getenv('ASYNC_PER_HOST_LIMIT', 8)),
+                        help='async modunda host başına eşzamanlı istek sınırı')
+    return parser.parse_args()
+
+def _product_worker(worker_id, task_queue, result_queue, stop_event, total, fetch_mode, lean):
+    """Kuyruktan ürün alıp kendi tarayıcısı/HTTP oturumuyla işleyen worker."""
+    fetcher = ProductFetcher(fetch_mode, name=f"Worker {worker_id}", lean=lean)
+    processed = 0
+    try:
+        while not stop_event.is_set():
+            try:
+                index, product = task_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            # İstek hızı tüm worker'ların paylaştığı RATE_LIMITER ile sınırlanır
+            competitor_prices = fetcher.process(product, index + 1, total)
+            result_queue.put((index, competitor_prices))
+            processed += 1
+    except Exception as e:
+        logger.error(f"Worker {worker_id} hata ile durdu: {str(e)}")
+        import traceback
+        logger.error(traceback.format_exc())
+    finally:
+        fetcher.close()
+        logger.info(f"Worker {worker_id}: {processed} ürün işlendi, kaynaklar kapatıldı.")
+
+def process_products_parallel(products, workers, fetch_mode, on_result, lean=LEAN_PROFILE):
+    """Ürünleri birden fazla izole tarayıcı ile paralel işler.
+    
+    Her worker ortak kuyruktan ürün çeker, sonuçlar tek bir toplayıcıda
+    on_result ile tamamlanma sırasına göre teslim edilir. İşlenen sonuç
+    sayısını döndürür.
+    """
+    task_queue = queue.Queue()
+    result_queue = queue.Queue()
+    stop_event = threading.Event()
+    
+    for index, product in enumerate(products):
+        task_queue.put((index, product))
+    
+    workers = max(1, min(workers, len(products)))
+    logger.info(f"{len(products)} ürün {workers} worker ile işlenecek.")
+    
+    threads = []
+    for worker_id in range(1, workers + 1):
+        thread = threading.Thread(
+            target=_product_worker,
+            args=(worker_id, task_queue, result_queue, stop_event, len(products), fetch_mode, lean),
+            name=f"product-worker-{worker_id}",
+            daemon=True
+        )
+        thread.start()
+        threads.append(thread)
+    
+    collected = 0
+    try:
+        # Tüm worker'lar bitene ve kuyruk boşalana kadar sonuçları topla
+        while any(thread.is_alive() for thread in threads) or not result_queue.empty():
+            try:
+                index, competitor_prices = result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if competitor_prices:
+                on_result(competitor_prices)
+                collected += 1
+    except KeyboardInterrupt:
+        logger.warning("İşlem kullanıcı tarafından durduruldu. Worker'lar kapatılıyor...")
+        stop_event.set()
+        RATE_LIMITER.cancel_waits()
+        for thread in threads:
+            thread.join()
+        # Kapanış sırasında gelen sonuçları da günlüğe al; çalışma --resume ile sürdürülebilir
+        while not result_queue.empty():
+            index, competitor_prices = result_queue.get_nowait()
+            if competitor_prices:
+                on_result(competitor_prices)
+                collected += 1
+        # Sıralı moddaki gibi kesinti yukarı iletilir; yarım sonuçlar çıktı dosyalarına yazılmaz
+        raise
+    
+    if not task_queue.empty() and not stop_event.is_set():
+        logger.warning(f"{task_queue.qsize()} ürün işlenemedi (tüm worker'lar durdu).")
+    
+    return collected
+
+def process_products_async(products, concurrency, per_host_limit, workers, on_result, lean=LEAN_PROFILE):
+    """Ürünleri asyncio motoruyla tarar; HTTP ile alınamayanları tarayıcıyla işler."""
+    from async_crawler import run_async_crawl
+    
+    # Arşiv ve tarama indeksi bu modülün durumunda tutulur; yardımcılar buradan verilir
+    collected, fallback_indices, report = run_async_crawl(products, on_result, build_product_result, PageSnapshot,
+                                                          concurrency, per_host_limit)
+    
+    if fallback_indices:
+        fallback_products = [products[index] for index in fallback_indices]
+        logger.info(f"{len(fallback_products)} ürün Selenium ile yeniden işlenecek.")
+        if workers and workers > 1:
+            collected += process_products_parallel(fallback_products, workers, 'browser', on_result, lean=lean)
+        else:
+            collected += process_products_sequential(fallback_products, 'browser', on_result, lean=lean)
+    
+    return collected
+
+def process_products_sequential(products, fetch_mode, on_result, lean=LEAN_PROFILE):
+    """Ürünleri tek tarayıcı/HTTP oturumuyla sırayla işler."""
+    # Tarayıcı/HTTP oturumunu hazırla (tarayıcı ilk ihtiyaçta başlatılır)
+    fetcher = ProductFetcher(fetch_mode, lean=lean)
+    
+    # Tüm ürünleri işle
+    collected = 0
+    
+    try:
+        for i, product in enumerate(products):
+            # Bekleme RATE_LIMITER tarafından istek öncesinde yapılır
+            competitor_prices = fetcher.process(product, i+1, len(products))
+            if competitor_prices:
+                on_result(competitor_prices)
+                collected += 1
+    finally:
+        # Tarayıcıyı ve HTTP oturumunu kapat
+        fetcher.close()
+        logger.info("Tarayıcı kapatıldı.")
+    
+    return collected
+
+class ResultJournal:
+    """Ürün sonuçlarını geldikleri anda satır satır ekleyen JSONL günlüğü.
+    
+    Her satır diske yazılıp fsync edilir; çalışma yarıda kesilse bile o ana
+    kadarki sonuçlar korunur ve --resume ile kaldığı yerden devam edilir.
+    """
+    
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        if resume:
+            repair_journal_tail(path)
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+    
+    def append(self, result):
+        """Bir sonucu günlüğe ekler."""
+        line = json.dumps(result, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.count += 1
+    
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+def repair_journal_tail(path):
+    """Çökme sırasında yarım kalmış son satırı düzeltir.
+    
+    Son satır geçerli JSON ise sadece eksik satır sonu eklenir; değilse dosya
+    son tam satırın sonuna kadar kesilir. Böylece devam eden çalışmanın ilk
+    sonucu yarım satırla birleşmez.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # Son tam satırın sonu, dosya sonundan geriye doğru parça parça okunarak bulunur
+        line_start = 0
+        position = size
+        while position > 0:
+            step = min(65536, position)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b'\n')
+            if newline != -1:
+                line_start = position + newline + 1
+                break
+        f.seek(line_start)
+        last_line = f.read()
+        try:
+            json.loads(last_line)
+        except ValueError:
+            f.truncate(line_start)
+            logger.warning(f"Günlükteki yarım satır silindi ({size - line_start} bayt).")
+        else:
+            f.write(b'\n')
+
+def iter_journal(path):
+    """Günlükteki (konum, sonuç) çiftlerini sırayla okur; bozuk satırları atlar."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                # Çökme sırasında yarım kalmış son satır
+                logger.warning(f"Günlükte bozuk satır atlandı (konum {offset}).")
+
+def load_journal_product_ids(path):
+    """Günlükte sonucu bulunan ürün ID'lerini döndürür."""
+    return {str(result['product_id']) for _, result in iter_journal(path) if result.get('product_id')}
+
+def iter_compacted_journal(journal_path, product_order=None):
+    """Günlükteki sonuçları tekilleştirilmiş ve sıralı olarak akış halinde üretir.
+    
+    Aynı ürün birden fazla kez yazıldıysa son sonuç kullanılır. Sonuçlar
+    product_order sırasına göre, kalanlar günlük sırasıyla üretilir. Bellekte
+    yalnızca ürün ID -> konum eşlemesi tutulur.
+    """
+    last_offsets = {}
+    unkeyed_offsets = []
+    for offset, result in iter_journal(journal_path):
+        if result.get('product_id'):
+            last_offsets[str(result['product_id'])] = offset
+        else:
+            unkeyed_offsets.append(offset)
+    
+    ordered_offsets = []
+    for product_id in product_order or []:
+        offset = last_offsets.pop(str(product_id), None)
+        if offset is not None:
+            ordered_offsets.append(offset)
+    ordered_offsets.extend(sorted(list(last_offsets.values()) + unkeyed_offsets))
+    
+    if not ordered_offsets:
+        return
+    with open(journal_path, 'rb') as journal:
+        for offset in ordered_offsets:
+            journal.seek(offset)
+            yield json.loads(journal.readline())
+
+class JsonListWriter:
+    """JSON listesini öğe öğe geçici dosyaya yazar; close() ile hedef dosyaya atomik olarak taşır."""
+    
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path + '.tmp', 'w', encoding='utf-8')
+        self._file.write('[')
+    
+    def write(self, item):
+        text = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        self._file.write((',\n  ' if self.count else '\n  ') + text)
+        self.count += 1
+    
+    def close(self):
+        """Listeyi kapatır ve dosyayı yerine koyar."""
+        self._file.write('\n]' if self.count else ']')
+        self._file.close()
+        os.replace(self.path + '.tmp', self.path)
+    
+    def discard(self):
+        """Tamamlanmamış yazımı siler; close() sonrası bir şey yapmaz."""
+        if not self._file.closed:
+            self._file.close()
+            os.remove(self.path + '.tmp')
+
+def compact_journal(journal_path, output_path, product_order=None):
+    """Günlüğü mevcut JSON liste formatında çıktı dosyasına dönüştürür."""
+    writer = JsonListWriter(output_path)
+    try:
+        for result in iter_compacted_journal(journal_path, product_order):
+            writer.write(result)
+        writer.close()
+    finally:
+        writer.discard()
+    written = writer.count
+    
+    logger.info(f"Günlük '{journal_path}' sıkıştırıldı: {written} ürün '{output_path}' dosyasına kaydedildi.")
+    return written
+
+def load_fetch_index():
+    """Ürün başına son başarılı tarama zamanlarını (epoch) yükler."""
+    if not os.path.exists(FETCH_INDEX_FILE):
+        return {}
+    try:
+        with open(FETCH_INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Tarama indeksi yüklenirken hata: {str(e)}")
+        return {}
+
+def record_fetch(product_id):
+    """Ürünün state verisinin başarıyla alındığı zamanı kaydeder."""
+    if not product_id:
+        return
+    with _fetch_index_lock:
+        FETCH_TIMESTAMPS[str(product_id)] = time.time()
+
+def save_fetch_index():
+    """Bu çalışmadaki tarama zamanlarını mevcut indeksle birleştirip kaydeder."""
+    fetch_index = load_fetch_index()
+    with _fetch_index_lock:
+        fetch_index.update(FETCH_TIMESTAMPS)
+    atomic_write_json(FETCH_INDEX_FILE, fetch_index)
+    logger.info(f"Tarama indeksi '{FETCH_INDEX_FILE}' dosyasına kaydedildi ({len(fetch_index)} ürün).")
+
+def select_stale_products(products, ttl_hours):
+    """Yeniden taranması gereken ürünleri ve korunacak eski sonuçları ayırır.
+    
+    Son taraması ttl_hours saatten yeni olan ve önceki COMPETITOR_DATA_FILE
+    içinde sonucu bulunan ürünler atlanır; diğerleri yeniden taranır.
+    """
+    fetch_index = load_fetch_index()
+    previous = {}
+    if os.path.exists(COMPETITOR_DATA_FILE):
+        try:
+            with open(COMPETITOR_DATA_FILE, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    if item.get('product_id'):
+                        previous[str(item['product_id'])] = item
+        except Exception as e:
+            logger.error(f"Önceki rakip fiyatları yüklenirken hata: {str(e)}")
+    
+    now = time.time()
+    ttl_seconds = ttl_hours * 3600
+    stale = []
+    retained = {}
+    for product in products:
+        product_id = resolve_product_id(product)
+        key = str(product_id) if product_id else None
+        fetched_at = fetch_index.get(key) if key else None
+        if fetched_at and now - fetched_at < ttl_seconds and key in previous:
+            retained[key] = previous[key]
+        else:
+            stale.append(product)
+    
+    logger.info(f"Artımlı tarama: {len(stale)} ürün yeni/eski, {len(retained)} ürün güncel (TTL {ttl_hours} saat).")
+    return stale, retained
+
 def process_all_products(limit=None, page_limit=None):
-    """Tüm ürünleri işler."""
+    """Tüm ürünleri işler ve kaydedilen ürün sayısını döndürür; hata durumunda None döner."""
+    progress = None
     try:
         # Komut satırı argümanlarını işle
-        parser = argparse.ArgumentParser(description='Trendyol ürünlerini işle ve rakip fiyatlarını çek.')
-        parser.add_argument('--only-fetch', action='store_true', help='Sadece ürünleri çek, işleme')
-        parser.add_argument('--only-process', action='store_true', help='Sadece mevcut ürünleri işle, yeni çekme')
-        parser.add_argument('--shop-url', type=str, help='Mağaza URL\'si')
-        parser.add_argument('--limit', type=int, help='İşlenecek maksimum ürün sayısı')
-        parser.add_argument('--page-limit', type=int, default=5, help='Taranacak maksimum sayfa sayısı')
+        args = parse_arguments()
+        
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S')
+        if SCRAPE_PROGRESS_FILE:
+            progress = ProgressReporter(SCRAPE_PROGRESS_FILE, run_id,
+                                        extra=lambda: {'rate_limit': RATE_LIMITER.metrics()})
+        
+        DEBUG_CAPTURE.mode = args.debug_capture
         
-        args = parser.parse_args()
+        # Çoklu mağaza modunda tüm mağazaların ürünleri tek listede, tek worker havuzunda taranır
+        shop_urls = parse_shop_list(args.shops)
+        shop_products = None
         
         # Ürün listesini oku veya parametre olarak verilen ürünleri kullan
-        if args.only_process:
+        if args.only_process and shop_urls:
+            shop_products = load_shop_products(shop_urls)
+            if not shop_products:
+                logger.error("Hiçbir mağazanın ürün dosyası yüklenemedi.")
+                if progress:
+                    progress.phase('failed')
+                return None
+            products = dedupe_shop_products(shop_products)
+        elif args.only_process:
             try:
                 with open(PRODUCTS_FILE, 'r', encoding='utf-8') as f:
                     products = json.load(f)
                 logger.info(f"'{PRODUCTS_FILE}' dosyasından {len(products)} ürün yüklendi.")
             except Exception as e:
                 logger.error(f"Ürün dosyası yüklenirken hata: {str(e)}")
-                return []
+                if progress:
+                    progress.phase('failed')
+                return None
         else:
-            driver = setup_driver()
-            products = get_products_from_shop(driver, page_limit=args.page_limit)
+            if progress:
+                progress.phase('listing')
+            driver = setup_driver(lean=args.lean)
+            try:
+                if shop_urls:
+                    shop_products = discover_shops(driver, shop_urls, page_limit=args.page_limit,
+                                                   card_extraction=args.card_extraction, listing_workers=args.listing_workers)
+                    products = dedupe_shop_products(shop_products)
+                    atomic_write_json(PRODUCTS_FILE, products, ensure_ascii=False, indent=2)
+                else:
+                    products = get_products_from_shop(driver, args.shop_url, page_limit=args.page_limit,
+                                                      card_extraction=args.card_extraction, listing_workers=args.listing_workers)
+            finally:
+                driver.quit()
             logger.info(f"Mağaza sayfasından {len(products)} ürün çekildi.")
             
             # Sadece çekme modunda ise, işleme yapma
             if args.only_fetch:
                 logger.info("Sadece çekme modu seçildi. Ürünler işlenmeyecek.")
-                return []
+                if progress:
+                    progress.phase('done')
+                return 0
         
         logger.info(f"Toplam {len(products)} ürün işlenecek.")
         
         # product_data klasörünü oluştur (yoksa)
         os.makedirs(PRODUCT_DATA_DIR, exist_ok=True)
         
-        # product_data klasörünü temizle
-        import glob
-        for file_path in glob.glob(f'{PRODUCT_DATA_DIR}/*'):
-            try:
-                os.remove(file_path)
-                logger.info(f"Eski dosya silindi: {file_path}")
-            except Exception as e:
-                logger.error(f"Dosya silinirken hata: {str(e)}")
+        if limit:
+            products = products[:limit]
         
-        # Tarayıcıyı başlat
-        driver = setup_driver()
-        logger.info("Chrome başlatıldı.")
+        # Artımlı modda güncel ürünler atlanır, eski sonuçları korunur
+        retained = {}
+        products_to_process = products
+        if args.incremental:
+            products_to_process, retained = select_stale_products(products, args.ttl_hours)
+        elif not args.resume:
+            # product_data klasörünü temizle
+            import glob
+            for file_path in glob.glob(f'{PRODUCT_DATA_DIR}/*'):
+                try:
+                    os.remove(file_path)
+                    logger.info(f"Eski dosya silindi: {file_path}")
+                except Exception as e:
+                    logger.error(f"Dosya silinirken hata: {str(e)}")
         
-        # Cookie'leri ekle
-        add_cookies(driver)
-        logger.info("Cookie'ler eklendi.")
+        # Devam modunda günlükte sonucu olan ürünler atlanır
+        done_ids = set()
+        if args.resume:
+            done_ids = load_journal_product_ids(COMPETITOR_JOURNAL_FILE)
+            products_to_process = [p for p in products_to_process if str(resolve_product_id(p)) not in done_ids]
+            logger.info(f"Devam modu: günlükte {len(done_ids)} ürün var, {len(products_to_process)} ürün işlenecek.")
         
-        # Tüm ürünleri işle
-        all_competitor_data = []
+        # Ham state verisi çalışma boyunca arşive yazılır
+        global RAW_ARCHIVE
+        if RAW_ARCHIVE_DIR:
+            RAW_ARCHIVE = RawArchive(run_id, RAW_ARCHIVE_DIR)
         
-        for i, product in enumerate(products):
-            if limit and i >= limit:
-                break
+        # Sonuçlar geldikçe günlüğe yazılır
+        journal = ResultJournal(COMPETITOR_JOURNAL_FILE, resume=args.resume)
+        try:
+            for product_id, result in retained.items():
+                if product_id not in done_ids:
+                    journal.append(result)
             
-            competitor_prices = process_product(driver, product, i+1, len(products))
-            if competitor_prices:
-                all_competitor_data.append(competitor_prices)
+            on_result = journal.append
+            if progress:
+                progress.phase('products', total=len(products_to_process))
+                on_result = progress.wrap(journal.append)
             
-            # Her 5 üründe bir 10 saniye bekle (rate limiting önlemi)
-            if (i + 1) % WAIT_AFTER_PRODUCTS == 0 and i < len(products) - 1:
-                logger.info("Rate limiting önlemi: {} saniye bekleniyor...".format(WAIT_TIME_SECONDS))
-                time.sleep(WAIT_TIME_SECONDS)
-        
-        # Tüm rakip fiyatlarını kaydet
-        with open(COMPETITOR_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_competitor_data, f, ensure_ascii=False, indent=2)
-        logger.info(f"Rakip fiyatları '{COMPETITOR_DATA_FILE}' dosyasına kaydedildi.")
-        
-        # Tarayıcıyı kapat
-        driver.quit()
-        logger.info("Tarayıcı kapatıldı.")
+            if not products_to_process:
+                logger.info("Yeniden taranacak ürün yok.")
+            elif args.fetch_mode == 'async':
+                # Async mod: tek süreçte eşzamanlı HTTP, engellenen ürünler tarayıcıyla
+                process_products_async(products_to_process, args.concurrency, args.per_host_limit, args.workers, on_result,
+                                       lean=args.lean)
+            elif args.workers and args.workers > 1:
+                # Paralel mod: her worker kendi tarayıcısını açar
+                process_products_parallel(products_to_process, args.workers, args.fetch_mode, on_result, lean=args.lean)
+            else:
+                process_products_sequential(products_to_process, args.fetch_mode, on_result, lean=args.lean)
+        finally:
+            journal.close()
+            if RAW_ARCHIVE is not None:
+                RAW_ARCHIVE.close()
+                RAW_ARCHIVE = None
         
-        return all_competitor_data
+        # Günlüğü tek JSON dosyasına dönüştür, tarama zamanlarını kaydet
+        if progress:
+            progress.phase('finalizing')
+        product_order = [p.get('product_id') for p in products]
+        written = compact_journal(COMPETITOR_JOURNAL_FILE, COMPETITOR_DATA_FILE, product_order)
+        save_fetch_index()
+        if shop_products:
+            write_shop_outputs(shop_products, iter_compacted_journal(COMPETITOR_JOURNAL_FILE, product_order))
+        
+        # Fiyat geçmişine ekle
+        if PRICE_HISTORY_DB:
+            try:
+                import price_history
+                # Artımlı modda korunan sonuçların gözlemleri önceki çalışmalarda zaten kayıtlı
+                price_history.record_run(iter_compacted_journal(COMPETITOR_JOURNAL_FILE, product_order),
+                                         run_id, PRICE_HISTORY_DB, retained_ids=retained.keys())
+            except Exception as e:
+                logger.error(f"Fiyat geçmişi kaydedilirken hata: {str(e)}")
+        
+        # Sütunlu anlık görüntü yaz (pyarrow gerekir)
+        if SNAPSHOT_DIR:
+            try:
+                import columnar_snapshots
+                columnar_snapshots.write_snapshot(iter_compacted_journal(COMPETITOR_JOURNAL_FILE, product_order),
+                                                  run_id, SNAPSHOT_DIR)
+            except Exception as e:
+                logger.error(f"Sütunlu anlık görüntü yazılırken hata: {str(e)}")
+        
+        # Tüm çıktılar yazıldıktan sonra veri sürümünü yayınla; dashboard sadece bu dosyayı izler
+        if DATA_MANIFEST_FILE:
+            try:
+                write_manifest(run_id, written, COMPETITOR_DATA_FILE, DATA_MANIFEST_FILE)
+            except Exception as e:
+                logger.error(f"Veri sürümü yazılırken hata: {str(e)}")
+        log_run_stats()
+        DEBUG_CAPTURE.close()
+        if progress:
+            progress.phase('done')
+        
+        return written
         
     except Exception as e:
         logger.error(f"Ürünler işlenirken hata: {str(e)}")
         import traceback
         logger.error(traceback.format_exc())
-        return []
+        if progress:
+            progress.phase('failed')
+        return None
     
 def main():
     """Ana fonksiyon."""
-    import argparse
-    
-    # Komut satırı argümanlarını tanımla
-    parser = argparse.ArgumentParser(description='Trendyol Ürün ve Rakip Fiyat Takip Aracı')
-    parser.add_argument('--only-fetch', action='store_true', help='Sadece ürünleri çek, işleme')
-    parser.add_argument('--only-process', action='store_true', help='Sadece mevcut ürünleri işle, yeni çekme')
-    parser.add_argument('--shop-url', help='Mağaza URL\'si (varsayılan: .env dosyasındaki)')
-    parser.add_argument('--limit', type=int, help='İşlenecek maksimum ürün sayısı')
-    parser.add_argument('--page-limit', type=int, default=5, help='Taranacak maksimum sayfa sayısı')
-    
-    args = parser.parse_args()
-    
-    # Mağaza URL'sini güncelle (eğer belirtildiyse)
-    global TRENDYOL_SHOP_URL
+    # Komut satırı argümanlarını işle; mağaza URL'si ve diğer seçenekler process_all_products içinde okunur
+    args = parse_arguments()
     if args.shop_url:
-        TRENDYOL_SHOP_URL = args.shop_url
-        logger.info(f"Mağaza URL'si komut satırı argümanından alındı: {TRENDYOL_SHOP_URL}")
-    
-    # Tarayıcıyı başlat
-    driver = None
-    products = None
+        logger.info(f"Mağaza URL'si komut satırı argümanından alındı: {args.shop_url}")
     
-    try:
-        # Sadece işleme modu değilse, ürünleri çek
-        if not args.only_process:
-            driver = setup_driver()
-            products = get_products_from_shop(driver, page_limit=args.page_limit)
-            logger.info(f"Mağaza sayfasından {len(products)} ürün çekildi.")
-            
-            # Sadece çekme modunda ise, işleme yapma
-            if args.only_fetch:
-                logger.info("Sadece çekme modu seçildi. Ürünler işlenmeyecek.")
-                return
-        
-        # Ürünleri işle
-        if not args.only_fetch:
-            if driver is None:
-                driver = setup_driver()
-            
-            process_all_products(limit=args.limit, page_limit=args.page_limit)
-            logger.info("Tüm ürünler işlendi.")
-    
-    finally:
-        # Tarayıcıyı kapat
-        if driver:
-            driver.quit()
-            logger.info("Tarayıcı kapatıldı.")
+    # Ürünleri çek ve işle (--only-fetch / --only-process dahil)
+    written = process_all_products(limit=args.limit, page_limit=args.page_limit)
+    if written is None:
+        # Dashboard tarama işi çıkış koduyla da başarısız sayılır
+        sys.exit(1)
+    if not args.only_fetch:
+        logger.info("Tüm ürünler işlendi.")
 
 if __name__ == "__main__":
     main()
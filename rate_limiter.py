@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Tüm istek yollarının paylaştığı uyarlanabilir hız sınırlayıcı.
+
+Token bucket ile istekler saniyede en fazla `rate` olacak şekilde dağıtılır,
+kısa süreli ani artışlar için `burst` kadar token biriktirilebilir. Hız AIMD
+ile ayarlanır: art arda başarılı isteklerde hız sabit adımla artar, engel
+veya hata sayfası (ürün verisi yok, "Access Denied", HTTP 403/429/503)
+görüldüğünde hız çarpanla düşer ve biriken tokenlar silinir. Böylece
+Trendyol yanıt verdiği sürece sürdürülebilir en yüksek hızda çalışılır.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Başlangıç, en düşük ve en yüksek hız (istek/sn)
+RATE_LIMIT_INITIAL = float(os.getenv('RATE_LIMIT_INITIAL', 1.0))
+RATE_LIMIT_MIN = float(os.getenv('RATE_LIMIT_MIN', 0.1))
+RATE_LIMIT_MAX = float(os.getenv('RATE_LIMIT_MAX', 10.0))
+# Birikebilecek en fazla token (ani artış)
+RATE_LIMIT_BURST = float(os.getenv('RATE_LIMIT_BURST', 5))
+# Her RATE_LIMIT_SUCCESS_WINDOW başarılı istekte hız bu kadar artar (istek/sn)
+RATE_LIMIT_INCREASE = float(os.getenv('RATE_LIMIT_INCREASE', 0.2))
+RATE_LIMIT_SUCCESS_WINDOW = int(os.getenv('RATE_LIMIT_SUCCESS_WINDOW', 10))
+# Engel görüldüğünde hız bu çarpanla düşer
+RATE_LIMIT_DECREASE_FACTOR = float(os.getenv('RATE_LIMIT_DECREASE_FACTOR', 0.5))
+# Uçuştaki isteklerin aynı engel için hızı tekrar tekrar düşürmemesi için bekleme (saniye)
+RATE_LIMIT_COOLDOWN_SECONDS = float(os.getenv('RATE_LIMIT_COOLDOWN_SECONDS', 5))
+
+CHALLENGE_MARKERS = {
+    'Just a moment...': 'cloudflare',
+    'cf-chl': 'cloudflare',
+    'challenge-platform': 'cloudflare',
+    'Attention Required': 'cloudflare',
+    'Access Denied': 'access_denied',
+}
+
+logger = logging.getLogger(__name__)
+
+def challenge_reason(status_code, page_source):
+    """Yanıt bir engel sayfasıysa nedenini (örn. 'http_429', 'access_denied') döndürür, değilse None.
+
+    Cloudflare normal 200 sayfalarına da challenge-platform betiği ekler; bu
+    yüzden çağıranlar önce sadece durum kodunu (page_source=None) kontrol
+    etmeli, gövde işaretlerini ise state veya ürün kartı bulunamadığında
+    (status_code=None) kullanmalıdır.
+    """
+    if status_code in (403, 429, 503):
+        return f'http_{status_code}'
+    if page_source:
+        for marker, reason in CHALLENGE_MARKERS.items():
+            if marker in page_source:
+                return reason
+    return None
+
+class AdaptiveRateLimiter:
+    """Token bucket + AIMD hız sınırlayıcı; thread'ler ve asyncio görevleri arasında paylaşılabilir."""
+
+    def __init__(self, rate=RATE_LIMIT_INITIAL, min_rate=RATE_LIMIT_MIN, max_rate=RATE_LIMIT_MAX,
+                 burst=RATE_LIMIT_BURST, increase=RATE_LIMIT_INCREASE, success_window=RATE_LIMIT_SUCCESS_WINDOW,
+                 decrease_factor=RATE_LIMIT_DECREASE_FACTOR, cooldown=RATE_LIMIT_COOLDOWN_SECONDS):
+        self.min_rate = min_rate
+        self.max_rate = max(min_rate, max_rate)
+        self.rate = min(self.max_rate, max(min_rate, rate))
+        self.burst = max(1.0, burst)
+        self.increase = increase
+        self.success_window = max(1, success_window)
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._last_decrease = 0.0
+        self._streak = 0
+        self.events = deque(maxlen=50)
+        self.stats = {'acquired': 0, 'successes': 0, 'backoffs': 0, 'ignored_backoffs': 0,
+                      'increases': 0, 'decreases': 0, 'wait_seconds': 0.0, 'peak_rate': self.rate}
+        self.reasons = {}
+
+    def _reserve(self):
+        """Bir token ayırır ve isteğin beklemesi gereken süreyi döndürür.
+
+        Token yoksa bakiye eksiye düşer; sonraki istekler sırayla daha uzun bekler.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.stats['acquired'] += 1
+            self.stats['wait_seconds'] += wait
+            return wait
+
+    def acquire(self):
+        """İstek yapılabilene kadar bekler; beklenen süreyi döndürür."""
+        wait = self._reserve()
+        if wait > 0:
+            self._cancel.wait(wait)
+        return wait
+
+    async def acquire_async(self):
+        """acquire'ın asyncio sürümü; event loop'u bloklamaz."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def cancel_waits(self):
+        """Bekleyen ve sonraki acquire çağrılarının hemen dönmesini sağlar (kapanış için)."""
+        self._cancel.set()
+
+    def record_success(self):
+        """Başarılı isteği kaydeder; yeterince art arda başarıda hızı artırır (additive increase)."""
+        with self._lock:
+            self.stats['successes'] += 1
+            self._streak += 1
+            if self._streak < self.success_window or self.rate >= self.max_rate:
+                return
+            self._streak = 0
+            old_rate = self.rate
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.stats['increases'] += 1
+            self.stats['peak_rate'] = max(self.stats['peak_rate'], self.rate)
+        logger.debug(f"Hız sınırı artırıldı: {old_rate:.2f} -> {self.rate:.2f} istek/sn")
+
+    def record_backoff(self, reason):
+        """Engel/hata yanıtını kaydeder ve hızı düşürür (multiplicative decrease).
+
+        Son düşüşten bu yana cooldown süresi geçmediyse hız tekrar düşürülmez;
+        aynı anda uçuşta olan isteklerin hepsi aynı engeli görebilir.
+        """
+        with self._lock:
+            self.stats['backoffs'] += 1
+            self.reasons[reason] = self.reasons.get(reason, 0) + 1
+            self._streak = 0
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown:
+                self.stats['ignored_backoffs'] += 1
+                return
+            self._last_decrease = now
+            old_rate = self.rate
+            self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+            # Biriken tokenlar silinir, sonraki istek yeni hızla bekler
+            self._tokens = min(self._tokens, 0.0)
+            self.stats['decreases'] += 1
+            self.events.append({'time': time.time(), 'reason': reason,
+                                'rate_before': round(old_rate, 3), 'rate_after': round(self.rate, 3)})
+        logger.warning(f"Hız sınırı düşürüldü ({reason}): {old_rate:.2f} -> {self.rate:.2f} istek/sn")
+
+    def metrics(self):
+        """Güncel hızı, sayaçları, nedenleri ve son geri çekilme olaylarını döndürür."""
+        with self._lock:
+            metrics = dict(self.stats)
+            metrics.update({
+                'rate': round(self.rate, 3),
+                'peak_rate': round(self.stats['peak_rate'], 3),
+                'wait_seconds': round(self.stats['wait_seconds'], 1),
+                'reasons': dict(self.reasons),
+                'recent_backoffs': list(self.events)[-5:],
+            })
+            return metrics
+
+    def log_metrics(self):
+        """Çalışma sonunda hız sınırlayıcı özetini loglar."""
+        metrics = self.metrics()
+        if not metrics['acquired']:
+            return
+        reasons = ', '.join(f"{reason}: {count}" for reason, count in metrics['reasons'].items()) or 'yok'
+        logger.info(
+            f"Hız sınırlayıcı: {metrics['acquired']} istek, son hız {metrics['rate']:.2f} istek/sn "
+            f"(en yüksek {metrics['peak_rate']:.2f}), {metrics['decreases']} düşüş, {metrics['increases']} artış, "
+            f"toplam bekleme {metrics['wait_seconds']} sn, geri çekilme nedenleri: {reasons}"
+        )
+
+RATE_LIMITER = AdaptiveRateLimiter()
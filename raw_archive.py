@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""Ham ürün state verisini sıkıştırılmış, içerik adresli olarak arşivler.
+
+Her state nesnesi kanonik JSON'a çevrilir ve SHA-256 özetiyle
+objects/<ilk 2 karakter>/<özet>.json.zst (zstandard kuruluysa) veya
+.json.gz olarak bir kez yazılır. Değişmeyen sayfalar sonraki çalışmalarda
+yeniden yazılmaz, sadece index.jsonl içinde (çalışma, ürün) -> özet satırı
+eklenir.
+"""
+
+import os
+import gzip
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from dotenv import load_dotenv
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# .env dosyasını yükle
+load_dotenv()
+
+RAW_ARCHIVE_DIR = os.getenv('RAW_ARCHIVE_DIR', 'raw_archive')
+INDEX_FILE_NAME = 'index.jsonl'
+CODEC_EXTENSIONS = {'zstd': '.json.zst', 'gzip': '.json.gz'}
+
+logger = logging.getLogger(__name__)
+
+def default_codec():
+    """Kullanılabilir en iyi sıkıştırma yöntemini döndürür."""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+def canonical_bytes(state):
+    """State nesnesini anahtarları sıralı, boşluksuz JSON baytlarına çevirir."""
+    return json.dumps(state, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+def _compress(data, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+def _decompress(data, codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd ile sıkıştırılmış arşiv için zstandard paketi gerekli.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def object_path(root, digest, codec):
+    """Özete ait arşiv dosyasının yolunu döndürür."""
+    return os.path.join(root, 'objects', digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+class RawArchive:
+    """Bir çalışma boyunca ham state verisini arşive yazar.
+
+    Aynı içerik bir kez yazılır; birden fazla worker thread'i tarafından
+    güvenle kullanılabilir.
+    """
+
+    def __init__(self, run_id, root=RAW_ARCHIVE_DIR, codec=None):
+        self.run_id = run_id
+        self.root = root
+        self.codec = codec or default_codec()
+        self._lock = threading.Lock()
+        self._known = set()
+        self.stats = {'stored': 0, 'new_objects': 0, 'raw_bytes': 0, 'written_bytes': 0}
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+        self._index = open(os.path.join(root, INDEX_FILE_NAME), 'a', encoding='utf-8')
+
+    def store(self, product_id, state, data=None):
+        """State verisini arşivler ve içerik özetini döndürür.
+
+        data, state'in canonical_bytes çıktısı önceden üretildiyse verilebilir.
+        """
+        if data is None:
+            data = canonical_bytes(state)
+        digest = hashlib.sha256(data).hexdigest()
+        path = object_path(self.root, digest, self.codec)
+
+        with self._lock:
+            is_new = digest not in self._known and not os.path.exists(path)
+            self._known.add(digest)
+
+        written = 0
+        if is_new:
+            compressed = _compress(data, self.codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(temp_path, path)
+            written = len(compressed)
+
+        entry = {'run_id': self.run_id, 'product_id': str(product_id), 'hash': digest,
+                 'codec': self.codec, 'size': len(data), 'archived_at': time.time()}
+        line = json.dumps(entry) + '\n'
+        with self._lock:
+            self._index.write(line)
+            self._index.flush()
+            self.stats['stored'] += 1
+            self.stats['raw_bytes'] += len(data)
+            if is_new:
+                self.stats['new_objects'] += 1
+                self.stats['written_bytes'] += written
+        return digest
+
+    def close(self):
+        """İndeks dosyasını kapatır ve çalışma özetini loglar."""
+        with self._lock:
+            self._index.close()
+            stats = dict(self.stats)
+        if stats['stored']:
+            ratio = stats['raw_bytes'] / stats['written_bytes'] if stats['written_bytes'] else float('inf')
+            logger.info(
+                f"Ham veri arşivi: {stats['stored']} ürün, {stats['new_objects']} yeni nesne, "
+                f"{stats['raw_bytes'] / 1024:.0f} KB ham veri için {stats['written_bytes'] / 1024:.0f} KB yazıldı "
+                f"(x{ratio:.1f}, {self.codec})."
+            )
+
+def iter_index(root=RAW_ARCHIVE_DIR):
+    """İndeks satırlarını sırayla döndürür; bozuk satırları atlar."""
+    index_path = os.path.join(root, INDEX_FILE_NAME)
+    if not os.path.exists(index_path):
+        return
+    with open(index_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def load_object(digest, codec, root=RAW_ARCHIVE_DIR):
+    """Özeti verilen ham state verisini okuyup çözer."""
+    with open(object_path(root, digest, codec), 'rb') as f:
+        return json.loads(_decompress(f.read(), codec))
+
+def load_snapshot(product_id, run_id=None, root=RAW_ARCHIVE_DIR):
+    """Ürünün verilen çalışmadaki (verilmezse en son) ham state verisini döndürür; yoksa None."""
+    found = None
+    for entry in iter_index(root):
+        if entry['product_id'] == str(product_id) and (run_id is None or entry['run_id'] == run_id):
+            found = entry
+    if found is None:
+        return None
+    return load_object(found['hash'], found['codec'], root)
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""Dashboard'dan başlatılan arka plan tarama işleri.
+
+Her iş process_all_products.py'yi ayrı bir süreç olarak çalıştırır; istek
+thread'leri hiçbir zaman taramayı beklemez. İşler küçük bir SQLite
+tablosunda tutulur, böylece dashboard yeniden başlasa da geçmiş ve çalışan
+iş kaybolmaz. Scraper ilerlemesini (işlenen ürün, hız, kalan süre)
+SCRAPE_PROGRESS_FILE ortam değişkeniyle verilen dosyaya atomik olarak yazar;
+dashboard bu küçük dosyayı periyodik olarak okur.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import threading
+import subprocess
+
+from dotenv import load_dotenv
+
+from data_manifest import atomic_write_json
+
+# .env dosyasını yükle
+load_dotenv()
+
+SCRAPE_JOBS_DB = os.getenv('SCRAPE_JOBS_DB', 'scrape_jobs.db')
+# İş logları ve ilerleme dosyalarının dizini
+SCRAPE_JOBS_DIR = os.getenv('SCRAPE_JOBS_DIR', 'scrape_jobs')
+SCRAPER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'process_all_products.py')
+# İlerleme dosyası en fazla bu sıklıkla (saniye) yeniden yazılır
+PROGRESS_WRITE_INTERVAL = 1.0
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL,
+    args TEXT NOT NULL,
+    pid INTEGER,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    return_code INTEGER,
+    log_file TEXT,
+    progress_file TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status);
+"""
+
+def connect(db_path=SCRAPE_JOBS_DB):
+    """İş veritabanına bağlanır ve şemayı oluşturur."""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+def _pid_alive(pid):
+    """Sürecin hâlâ çalışıp çalışmadığını kontrol eder."""
+    if not pid or os.name == 'nt':
+        # Windows'ta os.kill(pid, 0) süreci sonlandırır; kontrol edilmez
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def read_progress(path):
+    """İlerleme dosyasını okur; yoksa veya yazılmamışsa None döner."""
+    if not path:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+class ProgressReporter:
+    """Scraper tarafında ilerlemeyi (aşama, işlenen ürün, hız, kalan süre) dosyaya yazar."""
+
+    def __init__(self, path, run_id, extra=None):
+        self.path = path
+        self.run_id = run_id
+        # Her yazımda duruma eklenecek ek metrikleri döndüren fonksiyon (örn. hız sınırlayıcı)
+        self.extra = extra
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self.state = {'run_id': run_id, 'phase': 'starting', 'total': 0, 'done': 0,
+                      'started_at': time.time(), 'phase_started_at': time.time(),
+                      'updated_at': time.time(), 'rate': None, 'eta_seconds': None}
+        self._write()
+
+    def _write(self):
+        try:
+            if self.extra is not None:
+                self.state.update(self.extra())
+            atomic_write_json(self.path, self.state)
+        except Exception as e:
+            logger.error(f"İlerleme dosyası yazılırken hata: {str(e)}")
+        self._last_write = time.time()
+
+    def phase(self, name, total=None):
+        """Yeni aşamaya geçer (listing, products, finalizing, done, failed)."""
+        with self._lock:
+            now = time.time()
+            self.state.update({'phase': name, 'phase_started_at': now, 'updated_at': now})
+            if total is not None:
+                self.state.update({'total': total, 'done': 0, 'rate': None, 'eta_seconds': None})
+            self._write()
+
+    def advance(self, count=1):
+        """İşlenen ürün sayısını artırır; dosya en fazla PROGRESS_WRITE_INTERVAL'de bir yazılır."""
+        with self._lock:
+            now = time.time()
+            state = self.state
+            state['done'] += count
+            state['updated_at'] = now
+            elapsed = now - state['phase_started_at']
+            if elapsed > 0:
+                state['rate'] = round(state['done'] / elapsed, 3)
+                remaining = max(0, state['total'] - state['done'])
+                state['eta_seconds'] = round(remaining / state['rate']) if state['rate'] else None
+            if now - self._last_write >= PROGRESS_WRITE_INTERVAL or state['done'] >= state['total']:
+                self._write()
+
+    def wrap(self, on_result):
+        """Sonuç callback'ini, her sonuçta ilerlemeyi de artıracak şekilde sarar."""
+        def record(result):
+            on_result(result)
+            self.advance()
+        return record
+
+class JobRunner:
+    """Tarama işlerini başlatır, izler ve iş tablosunu günceller.
+
+    Aynı anda tek bir tarama çalışır; çalışan iş varken yeni istek o işi döndürür.
+    """
+
+    def __init__(self, db_path=SCRAPE_JOBS_DB, jobs_dir=SCRAPE_JOBS_DIR, script=SCRAPER_SCRIPT):
+        self.db_path = db_path
+        self.jobs_dir = jobs_dir
+        self.script = script
+        self._lock = threading.Lock()
+        self._processes = {}
+        self.recover()
+
+    def _execute(self, sql, params=()):
+        conn = connect(self.db_path)
+        try:
+            with conn:
+                cursor = conn.execute(sql, params)
+            return cursor
+        finally:
+            conn.close()
+
+    def _query(self, sql, params=()):
+        conn = connect(self.db_path)
+        try:
+            return [dict(row) for row in conn.execute(sql, params)]
+        finally:
+            conn.close()
+
+    def recover(self):
+        """Önceki dashboard sürecinden kalan, artık çalışmayan işleri 'interrupted' olarak işaretler."""
+        for job in self._query("SELECT * FROM jobs WHERE status IN (?, ?)", ACTIVE_STATUSES):
+            if not _pid_alive(job['pid']):
+                self._finish(job['id'], 'interrupted', None)
+                logger.warning(f"Tarama işi #{job['id']} yarıda kalmış, 'interrupted' olarak işaretlendi.")
+
+    def _finish(self, job_id, status, return_code):
+        self._execute("UPDATE jobs SET status = ?, return_code = ?, finished_at = ? WHERE id = ?",
+                      (status, return_code, time.time(), job_id))
+
+    def get_job(self, job_id):
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def list_jobs(self, limit=20):
+        return self._query("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+
+    def active_job(self):
+        """Çalışan işi döndürür; süreci ölmüş işler bu sırada kapatılır."""
+        for job in self._query("SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY id DESC", ACTIVE_STATUSES):
+            if job['id'] in self._processes or _pid_alive(job['pid']):
+                return job
+            self._finish(job['id'], 'interrupted', None)
+        return None
+
+    def start(self, args=()):
+        """Yeni tarama işi başlatır; (iş, yeni_mi) döndürür. Çalışan iş varsa onu döndürür."""
+        with self._lock:
+            active = self.active_job()
+            if active is not None:
+                return active, False
+
+            os.makedirs(self.jobs_dir, exist_ok=True)
+            cursor = self._execute("INSERT INTO jobs (status, args, created_at) VALUES (?, ?, ?)",
+                                   ('queued', json.dumps(list(args)), time.time()))
+            job_id = cursor.lastrowid
+            log_file = os.path.join(self.jobs_dir, f'job-{job_id}.log')
+            progress_file = os.path.join(self.jobs_dir, f'job-{job_id}.progress.json')
+
+            env = dict(os.environ, SCRAPE_PROGRESS_FILE=progress_file, PYTHONUNBUFFERED='1')
+            try:
+                with open(log_file, 'ab') as log:
+                    process = subprocess.Popen([sys.executable, self.script, *args], stdout=log,
+                                               stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, env=env)
+            except Exception as e:
+                logger.error(f"Tarama işi #{job_id} başlatılamadı: {str(e)}")
+                self._finish(job_id, 'failed', None)
+                return self.get_job(job_id), True
+
+            self._execute("UPDATE jobs SET status = 'running', pid = ?, started_at = ?, log_file = ?, progress_file = ? "
+                          "WHERE id = ?", (process.pid, time.time(), log_file, progress_file, job_id))
+            self._processes[job_id] = process
+            threading.Thread(target=self._monitor, args=(job_id, process, progress_file),
+                             name=f'scrape-job-{job_id}', daemon=True).start()
+            logger.info(f"Tarama işi #{job_id} başlatıldı (pid {process.pid}): {' '.join(args) or 'varsayılan ayarlar'}")
+            return self.get_job(job_id), True
+
+    def _monitor(self, job_id, process, progress_file):
+        """Süreç bitene kadar bekler ve iş durumunu kaydeder."""
+        return_code = process.wait()
+        progress = read_progress(progress_file) or {}
+        # Scraper hataları yakalayıp 0 ile çıkabilir; ilerleme dosyasındaki aşama da kontrol edilir
+        status = 'succeeded' if return_code == 0 and progress.get('phase') != 'failed' else 'failed'
+        self._finish(job_id, status, return_code)
+        with self._lock:
+            self._processes.pop(job_id, None)
+        logger.info(f"Tarama işi #{job_id} bitti: {status} (çıkış kodu {return_code}).")
+
+    def latest_status(self):
+        """Son işi ve (varsa) ilerleme bilgisini döndürür; hiç iş yoksa None."""
+        jobs = self.list_jobs(limit=1)
+        if not jobs:
+            return None
+        job = jobs[0]
+        if job['status'] in ACTIVE_STATUSES and job['id'] not in self._processes and not _pid_alive(job['pid']):
+            self._finish(job['id'], 'interrupted', None)
+            job = self.get_job(job['id'])
+        job['progress'] = read_progress(job['progress_file'])
+        return job
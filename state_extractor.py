@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Sayfa kaynağından window.__PRODUCT_DETAIL_APP_INITIAL_STATE__ nesnesini çıkarır.
+
+Atama ifadesi düz metin aramasıyla bulunur ve o konumdan itibaren
+json.JSONDecoder.raw_decode ile tam olarak tek bir JSON değeri okunur.
+Böylece tüm sayfa üzerinde regex çalıştırılmaz ve string içindeki '};'
+dizileri nesneyi erken kesmez.
+"""
+
+import json
+
+STATE_VARIABLE = '__PRODUCT_DETAIL_APP_INITIAL_STATE__'
+
+# extract_competitor_prices tarafından kullanılan alt ağaçlar
+USED_STATE_SUBTREES = ('product.price', 'product.otherMerchants', 'otherMerchants')
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+def find_state_offset(page_source):
+    """State nesnesinin başladığı '{' karakterinin konumunu döndürür; bulunamazsa -1 döner."""
+    position = 0
+    while True:
+        position = page_source.find(STATE_VARIABLE, position)
+        if position == -1:
+            return -1
+        position += len(STATE_VARIABLE)
+
+        # window.X = {...}, window["X"] = {...} biçimlerini kabul et
+        index = position
+        while index < len(page_source) and page_source[index] in _WHITESPACE + '"\']':
+            index += 1
+        if index < len(page_source) and page_source[index] == '=':
+            index += 1
+            while index < len(page_source) and page_source[index] in _WHITESPACE:
+                index += 1
+            if index < len(page_source) and page_source[index] == '{':
+                return index
+
+def select_subtrees(state, paths=USED_STATE_SUBTREES):
+    """State nesnesinden yalnızca verilen noktalı yollardaki alt ağaçları içeren bir kopya döndürür."""
+    selected = {}
+    for path in paths:
+        keys = path.split('.')
+        value = state
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = selected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+    return selected
+
+def extract_state(page_source, subtrees=None):
+    """Sayfa kaynağından state nesnesini çözer.
+
+    subtrees verilirse (örn. USED_STATE_SUBTREES) yalnızca bu alt ağaçlar
+    döndürülür. Atama bulunamazsa None döner; JSON bozuksa
+    json.JSONDecodeError yükseltilir.
+    """
+    start = find_state_offset(page_source)
+    if start == -1:
+        return None
+
+    state, _ = _decoder.raw_decode(page_source, start)
+    if subtrees:
+        return select_subtrees(state, subtrees)
+    return state
+
+def state_source_snippet(page_source, limit=1024 * 1024):
+    """Hata ayıklama için state atamasından script sonuna kadarki metni döndürür."""
+    start = find_state_offset(page_source)
+    if start == -1:
+        return ''
+    end = page_source.find('</script>', start)
+    if end == -1:
+        end = len(page_source)
+    return page_source[start:min(end, start + limit)]
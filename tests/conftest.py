@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+# Testler yerel sunucuya gider; hız sınırlayıcı testleri yavaşlatmasın
+os.environ.setdefault('RATE_LIMIT_INITIAL', '100')
+os.environ.setdefault('RATE_LIMIT_MIN', '50')
+os.environ.setdefault('RATE_LIMIT_MAX', '100')
+os.environ.setdefault('DEBUG_CAPTURE_MODE', 'off')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (ROOT_DIR, TESTS_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Kaydedilmiş sayfaları yerel olarak sunan Trendyol yerine geçen HTTP sunucusu.
+
+Testlerde HTTP ve async çekme yolları gerçek siteye gitmeden bu sunucuya
+yönlendirilir. Her yol bir (fixture dosyası, HTTP durum kodu) çiftine eşlenir.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+@contextmanager
+def serve_pages(routes):
+    """routes: {'/yol': ('dosya.html', durum_kodu)}. Sunucunun temel URL'sini verir."""
+    pages = {path: (load_fixture(name), status) for path, (name, status) in routes.items()}
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?')[0]
+            requests_seen.append(path)
+            body, status = pages.get(path, (b'not found', 404))
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.requests_seen = requests_seen
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        server.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Dashboard veri yardımcılarının testleri."""
+
+import time
+
+import pandas as pd
+import pytest
+
+import app
+
+def test_operator_text_inside_value_is_not_an_operator():
+    assert app.split_filter_part('{Ürün Adı} contains "Kahve ile Süt"') == ('Ürün Adı', 'contains', 'Kahve ile Süt')
+    assert app.split_filter_part('{Satıcı} = "Single Shop"') == ('Satıcı', 'eq', 'Single Shop')
+    assert app.split_filter_part('{Fiyat} >= 100') == ('Fiyat', 'ge', 100.0)
+
+def test_table_query_matches_value_with_operator_text():
+    table = pd.DataFrame({'Satıcı': ['Single Shop', 'Diğer'], 'Fiyat': [10.0, 20.0]})
+
+    filtered = app.apply_table_query(table, '{Satıcı} contains "Single Shop"')
+
+    assert filtered['Satıcı'].tolist() == ['Single Shop']
+
+def test_numeric_price_without_value_field():
+    data = [{'product_id': '1', 'product_name': 'Ürün', 'my_price': 1249.9,
+             'competitors': [{'name': 'Rakip A', 'price': 1199}, {'name': 'Rakip B', 'price': {'text': '1.299,50 TL'}}]}]
+
+    df = app.create_price_dataframe(data)
+
+    assert df['Fiyat'].tolist() == [1249.9, 1199.0, 1299.5]
+
+def load_entry(monkeypatch, data, version):
+    """Verilen ürünlerden önbellek kaydı oluşturur."""
+    monkeypatch.setattr(app, 'data_source_signature', lambda: ('manifest', 'json', version))
+    monkeypatch.setattr(app, '_load_price_data', lambda: (data, app.create_price_dataframe(data), None))
+    return app.PriceDataCache().get()
+
+def product(product_id, my_price, competitor_prices):
+    return {'product_id': product_id, 'product_name': f'Ürün {product_id}', 'my_price': f'{my_price} TL',
+            'competitors': [{'name': f'Rakip {i}', 'price': f'{price} TL'} for i, price in enumerate(competitor_prices)]}
+
+class SwappingCache:
+    """İlk get() eski kaydı, sonrakiler yeni kaydı döndürür (istek sırasında veri yenilenmesi)."""
+
+    def __init__(self, *entries):
+        self.entries = list(entries)
+
+    def get(self):
+        return self.entries.pop(0) if len(self.entries) > 1 else self.entries[0]
+
+def test_view_positions_use_the_callers_entry(monkeypatch):
+    old = load_entry(monkeypatch, [product('1', 10, [5, 6, 7])], 'v1')
+    new = load_entry(monkeypatch, [product('2', 10, [20])], 'v2')
+    monkeypatch.setattr(app, 'PRICE_DATA_CACHE', SwappingCache(old, new))
+
+    rows, _ = app.update_table(0, 15, None, None, 'competitors', None, 'v1')
+
+    assert [row['Satıcı'] for row in rows] == ['Rakip 0', 'Rakip 1', 'Rakip 2']
+
+def test_product_figure_uses_the_resolved_entry(monkeypatch):
+    old = load_entry(monkeypatch, [product('1', 10, [5])], 'v1')
+    new = load_entry(monkeypatch, [product('1', 99, [98, 97])], 'v2')
+    monkeypatch.setattr(app, 'PRICE_DATA_CACHE', SwappingCache(old, new))
+
+    figure, _ = app.update_graph('1', 'v1')
+
+    assert sorted(y for trace in figure.data for y in trace.y) == [5.0, 10.0]
+
+@pytest.fixture
+def istanbul_time(monkeypatch):
+    monkeypatch.setenv('TZ', 'Europe/Istanbul')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def test_columnar_timestamps_are_shown_in_local_time(istanbul_time):
+    # 2023-11-14 22:13:20 UTC, İstanbul'da (UTC+3) ertesi gün 01:13:20
+    observed_at = pd.Series(pd.to_datetime([1700000000], unit='s'))
+
+    assert app.format_local_times(observed_at).tolist() == ['15.11.2023 01:13:20']
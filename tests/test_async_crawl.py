@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Async modun scraper'ı betik olarak çalıştırırken arşiv ve tarama indeksine yazdığının testi.
+
+Scraper dashboard işlerinde de `python process_all_products.py` olarak
+çalışır; bu yüzden test de ayrı bir süreçte, gerçek giriş noktasıyla yapılır.
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+from conftest import ROOT_DIR
+from stand_in_server import serve_pages
+
+ROUTES = {
+    '/ornek-urun-p-1001': ('product_page.html', 200),
+}
+
+def run_scraper(tmp_path, *args):
+    env = dict(os.environ,
+               PRODUCTS_FILE=str(tmp_path / 'products.json'),
+               COMPETITOR_DATA_FILE=str(tmp_path / 'all_competitor_prices.json'),
+               PRICE_HISTORY_DB=str(tmp_path / 'price_history.db'),
+               SNAPSHOT_DIR=str(tmp_path / 'snapshots'),
+               PRODUCT_DATA_DIR=str(tmp_path / 'product_data'),
+               RAW_ARCHIVE_DIR=str(tmp_path / 'raw_archive'),
+               DATA_MANIFEST_FILE=str(tmp_path / 'data_manifest.json'),
+               SCRAPE_PROGRESS_FILE=str(tmp_path / 'progress.json'),
+               TRENDYOL_SHOP_URLS='')
+    return subprocess.run([sys.executable, os.path.join(ROOT_DIR, 'process_all_products.py'), *args],
+                          cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+
+def test_async_run_writes_raw_archive_and_fetch_index(tmp_path):
+    with serve_pages(ROUTES) as server:
+        products = [{'product_id': '1001', 'product_name': 'Test',
+                     'product_url': server.base_url + '/ornek-urun-p-1001'}]
+        (tmp_path / 'products.json').write_text(json.dumps(products), encoding='utf-8')
+        completed = run_scraper(tmp_path, '--only-process', '--fetch-mode', 'async')
+
+    assert completed.returncode == 0, completed.stderr
+    with open(tmp_path / 'progress.json', encoding='utf-8') as f:
+        assert json.load(f)['phase'] == 'done'
+
+    with open(tmp_path / 'raw_archive' / 'index.jsonl', encoding='utf-8') as f:
+        archived = [json.loads(line) for line in f if line.strip()]
+    assert [entry['product_id'] for entry in archived] == ['1001']
+
+    with open(tmp_path / 'product_data' / 'fetch_index.json', encoding='utf-8') as f:
+        assert set(json.load(f)) == {'1001'}
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""HTTP hızlı yolunun (FETCH_MODE=http) yerel sunucuya karşı testleri."""
+
+import pytest
+
+import process_all_products
+from rate_limiter import RATE_LIMITER
+from stand_in_server import serve_pages
+
+ROUTES = {
+    '/ornek-urun-p-1001': ('product_page.html', 200),
+    '/engel-urun-p-1002': ('challenge_page.html', 403),
+    '/bozuk-urun-p-1003': ('broken_state_page.html', 200),
+    '/cf-betikli-urun-p-1004': ('product_page_cf_script.html', 200),
+}
+
+@pytest.fixture
+def server():
+    with serve_pages(ROUTES) as server:
+        yield server
+
+@pytest.fixture
+def fetcher(monkeypatch):
+    """HTTP modunda fetcher; Selenium'a geçişler tarayıcı açmadan kaydedilir."""
+    fallbacks = []
+
+    def fake_process_product(driver, product, index, total):
+        fallbacks.append(product['product_id'])
+        return {'product_id': product['product_id'], 'competitors': [], 'source': 'browser'}
+
+    monkeypatch.setattr(process_all_products, 'process_product', fake_process_product)
+    fetcher = process_all_products.ProductFetcher('http', name='test')
+    # Tarayıcı hiç başlatılmaz; geçiş sadece process_product çağrısıyla ölçülür
+    fetcher._driver = object()
+    fetcher.fallbacks = fallbacks
+    yield fetcher
+    fetcher._driver = None
+    fetcher.close()
+
+def product_for(server, path):
+    return {'product_id': path.rsplit('-p-', 1)[1], 'product_name': 'Test', 'product_url': server.base_url + path}
+
+def test_http_hit_builds_result_without_browser(server, fetcher):
+    result = fetcher.process(product_for(server, '/ornek-urun-p-1001'), 1, 1)
+
+    assert fetcher.fallbacks == []
+    assert fetcher.http_hits == 1
+    assert result['my_price_value'] == 1249.90
+    assert [c['name'] for c in result['competitors']] == ['Rakip A', 'Rakip B']
+    assert result['competitors'][0]['price_value'] == 1199.0
+
+def test_challenge_page_falls_back_to_selenium(server, fetcher):
+    product = product_for(server, '/engel-urun-p-1002')
+    assert process_all_products.fetch_product_snapshot_http(fetcher.session, product['product_url']) is None
+
+    result = fetcher.process(product, 1, 1)
+
+    assert fetcher.fallbacks == ['1002']
+    assert fetcher.browser_fallbacks == 1
+    assert result['source'] == 'browser'
+
+def test_unparseable_state_falls_back_to_selenium(server, fetcher):
+    result = fetcher.process(product_for(server, '/bozuk-urun-p-1003'), 1, 1)
+
+    assert fetcher.fallbacks == ['1003']
+    assert fetcher.http_hits == 0
+    assert result['source'] == 'browser'
+
+def test_cloudflare_script_on_valid_page_is_not_a_challenge(server, fetcher):
+    backoffs = RATE_LIMITER.metrics()['backoffs']
+
+    result = fetcher.process(product_for(server, '/cf-betikli-urun-p-1004'), 1, 1)
+
+    assert fetcher.fallbacks == []
+    assert result['my_price_value'] == 1249.90
+    assert RATE_LIMITER.metrics()['backoffs'] == backoffs
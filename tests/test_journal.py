@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Sonuç günlüğünün (JSONL) devam modu testleri."""
+
+import json
+
+from process_all_products import ResultJournal, compact_journal, load_journal_product_ids
+
+def write_journal(path, results, tail=''):
+    with open(path, 'w', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps(result) + '\n')
+        f.write(tail)
+
+def compacted(tmp_path, journal_path):
+    output_path = str(tmp_path / 'out.json')
+    compact_journal(journal_path, output_path)
+    with open(output_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def test_resume_after_truncated_line_keeps_next_result(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    write_journal(journal_path, [{'product_id': '1'}], tail='{"product_id": "2", "compet')
+
+    journal = ResultJournal(journal_path, resume=True)
+    journal.append({'product_id': '3'})
+    journal.close()
+
+    assert [r['product_id'] for r in compacted(tmp_path, journal_path)] == ['1', '3']
+
+def test_resume_keeps_complete_last_line_without_newline(tmp_path):
+    journal_path = str(tmp_path / 'journal.jsonl')
+    write_journal(journal_path, [{'product_id': '1'}], tail='{"product_id": "2"}')
+    # Devam modu bu ürünü tamamlanmış sayar; onarım onu silmemeli
+    assert load_journal_product_ids(journal_path) == {'1', '2'}
+
+    journal = ResultJournal(journal_path, resume=True)
+    journal.append({'product_id': '3'})
+    journal.close()
+
+    assert [r['product_id'] for r in compacted(tmp_path, journal_path)] == ['1', '2', '3']
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""Fiyat geçmişi deposunun artımlı çalışma testleri."""
+
+import price_history
+
+def result(product_id, price, last_update):
+    return {'product_id': product_id, 'product_name': f'Ürün {product_id}', 'my_price': f'{price} TL',
+            'my_price_value': price, 'competitors': [], 'last_update': last_update}
+
+def test_retained_results_are_not_recorded_again(tmp_path):
+    db_path = str(tmp_path / 'history.db')
+    price_history.record_run([result('1', 100.0, '01.01.2024 10:00:00'), result('2', 200.0, '01.01.2024 10:00:00')],
+                             'run-1', db_path)
+    # İkinci çalışmada sadece 1 taranır; 2'nin önceki sonucu korunur
+    rows = price_history.record_run([result('1', 90.0, '02.01.2024 10:00:00'), result('2', 200.0, '01.01.2024 10:00:00')],
+                                    'run-2', db_path, retained_ids={'2'})
+
+    assert rows == 1
+    assert [row['run_id'] for row in price_history.product_history('2', db_path)] == ['run-1']
+    snapshot = {item['product_id']: item['my_price_value'] for item in price_history.latest_snapshot(db_path)}
+    assert snapshot == {'1': 90.0, '2': 200.0}
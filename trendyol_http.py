@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Tarayıcısız (requests / aiohttp) çekme yollarının paylaştığı ayarlar ve yardımcılar.
+
+process_all_products ve async_crawler bu modülü ayrı ayrı import eder; böylece
+async motor scraper modülüne bağımlı olmaz. Buradaki her şey durumsuzdur.
+"""
+
+import os
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+TRENDYOL_COOKIES = os.getenv('TRENDYOL_COOKIES', '')
+HTTP_TIMEOUT_SECONDS = int(os.getenv('HTTP_TIMEOUT_SECONDS', 15))
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+# HTTP isteklerinde tarayıcı gibi görünmek için gönderilen başlıklar
+BROWSER_HEADERS = {
+    'User-Agent': USER_AGENT,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'tr-TR,tr;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+COOKIE_DOMAIN = '.trendyol.com'
+
+logger = logging.getLogger(__name__)
+
+def parse_cookie_string(cookies_str):
+    """'ad=değer; ad2=değer2' biçimindeki çerez metnini (ad, değer) listesine çevirir."""
+    cookies = []
+    for cookie_pair in cookies_str.split(';'):
+        if '=' in cookie_pair:
+            name, value = cookie_pair.strip().split('=', 1)
+            cookies.append((name, value))
+    return cookies
+
+def trendyol_cookies():
+    """TRENDYOL_COOKIES içindeki çerezleri döndürür; tanımlı değilse uyarı loglar."""
+    if not TRENDYOL_COOKIES:
+        logger.warning("TRENDYOL_COOKIES çevresel değişkeni tanımlanmamış. Cloudflare koruması aşılamayabilir.")
+        return []
+    return parse_cookie_string(TRENDYOL_COOKIES)
+
+def create_http_session(pool_size=10):
+    """Bağlantı havuzlu ve Trendyol çerezlerini taşıyan bir requests.Session oluşturur."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(BROWSER_HEADERS)
+    for name, value in trendyol_cookies():
+        session.cookies.set(name, value, domain=COOKIE_DOMAIN)
+    return session
+
+def resolve_product_id(product):
+    """Ürün ID'sini döndürür; yoksa URL'den çıkarıp ürüne ekler."""
+    product_id = product.get('product_id')
+    if not product_id:
+        product_url = product.get('product_url', '')
+        # URL formatı: https://www.trendyol.com/brand/name-p-123456789
+        parts = product_url.split('-p-')
+        if len(parts) > 1:
+            product_id = parts[1].split('?')[0].strip()
+            product['product_id'] = product_id
+            logger.info(f"Ürün ID URL'den çıkarıldı: {product_id}")
+        else:
+            logger.warning(f"Ürün ID URL'den çıkarılamadı: {product_url}")
+    return product_id